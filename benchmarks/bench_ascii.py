@@ -0,0 +1,107 @@
+"""Benchmark of the ascii list conversion of fluidfoam
+======================================================
+
+The fields and the owner file of ``output_samples/ascii`` are scaled up
+(their lists are repeated) in a temporary case. The conversion of their
+lists into numpy arrays is timed with the former pure Python code and with
+the numpy tokenizer now used by ``OpenFoamFile``, then the time of a whole
+read by ``OpenFoamFile`` is given for reference.
+
+Usage::
+
+    python benchmarks/bench_ascii.py [nb_repeat]
+
+"""
+
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+from fluidfoam import OpenFoamFile
+from fluidfoam.readof import _ascii_list
+
+sample = os.path.join(os.path.dirname(__file__), "..", "output_samples", "ascii")
+
+
+def scale_up(path_in, path_out, nb_repeat):
+    """Repeat nb_repeat times the list of an ascii OpenFoam file."""
+    with open(path_in, "rb") as f:
+        content = f.read()
+    head, tail = content.split(b"\n(\n", 1)
+    head, size = head.rsplit(b"\n", 1)
+    body, tail = tail.split(b"\n)\n", 1)
+    size = int(size) * nb_repeat
+    body = b"\n".join([body] * nb_repeat)
+    with open(path_out, "wb") as f:
+        f.write(head + b"\n%d\n(\n" % size + body + b"\n)\n" + tail)
+    return content
+
+
+def former_floats(data):
+    """Conversion done by fluidfoam <= 0.2.9 for fields and points."""
+    lines = data.split(b"\n(")
+    lines = [line.split(b")")[0] for line in lines]
+    data = b" ".join(lines).strip()
+    return np.array([float(s) for s in data.split()])
+
+
+def former_ints(data):
+    """Conversion done by fluidfoam <= 0.2.9 for owner, neighbour and sets."""
+    lines = data.split(b"\n(")[1:]
+    lines = [line.split(b")")[0] for line in lines]
+    data = b" ".join(lines).strip()
+    return np.array([int(s) for s in data.split()])
+
+
+def new_floats(data):
+    return _ascii_list(data.split(b"\n)", 1)[0])
+
+
+def new_ints(data):
+    return _ascii_list(data.split(b"\n(", 1)[-1].split(b")", 1)[0], dtype=np.int64)
+
+
+def bench(func, *args, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = perf_counter()
+        func(*args)
+        times.append(perf_counter() - t0)
+    return min(times)
+
+
+def main(nb_repeat=20000):
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, former, new in (
+            ("0/U", former_floats, new_floats),
+            ("0/sigma", former_floats, new_floats),
+            ("constant/polyMesh/points", former_floats, new_floats),
+            ("constant/polyMesh/owner", former_ints, new_ints),
+        ):
+            path = os.path.join(tmp, name.replace("/", "_"))
+            scale_up(os.path.join(sample, name), path, nb_repeat)
+            with open(path, "rb") as f:
+                content = f.read()
+            if name.startswith("0/"):
+                data = content.split(b"internalField")[1].split(b";")[0]
+                data = b"\n(".join(data.split(b"\n(")[1:])
+            else:
+                data = content.split(b"}", 1)[1].split(b"\n", 3)[-1]
+            t_former = bench(former, data)
+            t_new = bench(new, data)
+            t_read = bench(
+                OpenFoamFile, tmp, None, os.path.basename(path), False,
+                None, None, "F", 15, None, False,
+            )
+            print(
+                f"{name:25s} ({os.path.getsize(path) / 1e6:6.1f} MB): "
+                f"conversion {t_former:.3f} s -> {t_new:.3f} s "
+                f"(speedup {t_former / t_new:4.1f}), whole read {t_read:.3f} s"
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,105 @@
+"""Benchmark of the concurrent reading of gzipped fields
+=======================================================
+
+A synthetic case is written in a temporary directory: one time directory
+with ``nb_fields`` binary fields (scalars and vectors) of ``nb_cells``
+cells, compressed with gzip as with ``writeCompression on``. The whole
+time directory is read by ``readfields`` with an increasing number of
+threads, and the throughput is given in MB of decompressed data per
+second.
+
+Usage::
+
+    python benchmarks/bench_gzip_threads.py [nb_cells [nb_fields]]
+
+"""
+
+import os
+import sys
+import gzip
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+from fluidfoam import readfields
+
+header = b"""FoamFile
+{
+    version     2.0;
+    format      binary;
+    class       vol%sField;
+    arch        "LSB;label=32;scalar=64";
+    object      %s;
+}
+
+dimensions      [0 0 0 0 0 0 0];
+
+internalField   nonuniform List<%s>
+%d
+("""
+
+tail = b""")
+;
+
+boundaryField
+{
+    walls
+    {
+        type            zeroGradient;
+    }
+}
+"""
+
+
+def write_case(path, nb_cells, nb_fields):
+    """Write the gzipped fields of the synthetic case, return their size."""
+    os.makedirs(os.path.join(path, "0"))
+    rng = np.random.default_rng(0)
+    size = 0
+    for i in range(nb_fields):
+        name = b"field%d" % i
+        if i % 2:
+            kind, type_data, nb_comp = b"Vector", b"vector", 3
+        else:
+            kind, type_data, nb_comp = b"Scalar", b"scalar", 1
+        # values with a few digits, as the fields of a simulation
+        values = np.round(rng.random(nb_comp * nb_cells), 4)
+        content = (
+            header % (kind, name, type_data, nb_cells)
+            + values.tobytes()
+            + tail
+        )
+        size += len(content)
+        filename = os.path.join(path, "0", name.decode() + ".gz")
+        with gzip.open(filename, "wb", compresslevel=6) as f:
+            f.write(content)
+    return size
+
+
+def main(nb_cells=2000000, nb_fields=16):
+    with tempfile.TemporaryDirectory() as tmp:
+        size = write_case(tmp, nb_cells, nb_fields)
+        print(
+            f"{nb_fields} fields of {nb_cells} cells, "
+            f"{size / 1e6:.0f} MB decompressed, {os.cpu_count()} cpus"
+        )
+        t_ref = None
+        for workers in (1, 2, 4, 8, 16):
+            times = []
+            for _ in range(3):
+                t0 = perf_counter()
+                readfields(tmp, "0", verbose=False, workers=workers)
+                times.append(perf_counter() - t0)
+            t_read = min(times)
+            if t_ref is None:
+                t_ref = t_read
+            print(
+                f"{workers:2d} threads: {t_read:.3f} s, "
+                f"{size / 1e6 / t_read:7.1f} MB/s "
+                f"(speedup {t_ref / t_read:4.1f})"
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
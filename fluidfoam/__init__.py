@@ -2,7 +2,10 @@ import warnings
 
 from fluidfoam.readof import readscalar, readvector, readtensor
 from fluidfoam.readof import readsymmtensor, readfield, readmesh, getVolumes
-from fluidfoam.readof import typefield, OpenFoamFile
+from fluidfoam.readof import readfields, getPatchGeometry
+from fluidfoam.readof import TimeIndex, getTimeIndex
+from fluidfoam.readof import typefield, readheader, OpenFoamFile
+from fluidfoam.readof import MeshCache, mesh_cache
 from fluidfoam.processing1d import create1dprofil, read1dprofil
 from fluidfoam.processing1d import create1dprofil_spe, plot1dprofil
 from fluidfoam.processing1d import create1dprofilDFSEM, read1dprofilDFSEM
@@ -10,6 +13,7 @@ from fluidfoam.meshdesign import getgz, getdzs
 from fluidfoam.readpostpro import readforce, readprobes
 from fluidfoam.meshvisu import MeshVisu
 from fluidfoam.openfoamsimu import OpenFoamSimu
+from fluidfoam.readmpi import MPIReader
 from fluidfoam._version import __version__
 
 warnings.simplefilter("always", category=DeprecationWarning)
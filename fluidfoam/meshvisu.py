@@ -20,8 +20,7 @@ This module provides functions to read 2D OpenFoam Mesh:
 
 """
 
-from fluidfoam import OpenFoamFile
-import os
+from fluidfoam.readof import mesh_cache
 import numpy as np
 
 class MeshVisu(object):
@@ -61,26 +60,12 @@ class MeshVisu(object):
         ):
         """ by_default we expect the 2D mesh to be in xy-plane: """
         # Step 1: read point and face files:
-        # read faces in path/constant/polyMesh/
-        self.__facefile = OpenFoamFile(
-            path = os.path.join(path, 'constant/polyMesh'), 
-            name = "faces", 
-            verbose = verbose
-            )
-        
-        # if a time_name is given, read points in path/[time_name]/polyMesh/points
-        if time_name != None:
-            self.__pointfile = OpenFoamFile(
-                 path = path,
-                 time_name = time_name,
-                 name = 'polyMesh/points',
-                 verbose = verbose
-                )
-        # else, just read the constant/polyMesh/points file
-        else:
-            self.__pointfile = OpenFoamFile(
-                path = os.path.join(path, 'constant/polyMesh'), name = "points", verbose = verbose
-                )
+        # faces are read in path/constant/polyMesh/ and, if a time_name is
+        # given, points in path/[time_name]/polyMesh/points, else in the
+        # constant/polyMesh/points file (through the mesh cache)
+        mesh = mesh_cache.get(path, time_name=time_name)
+        self.__facefile = mesh.file("faces", verbose)
+        self.__pointfile = mesh.file("points", verbose)
              
         # Step 2: Define box. Only edges inside the box will be plot.
         if box != None:
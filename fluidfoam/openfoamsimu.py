@@ -11,8 +11,9 @@
 
 import os, sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from fluidfoam import readmesh, readfield, OpenFoamFile
+from fluidfoam import readmesh, readfield, OpenFoamFile, getTimeIndex
 
 class Error(Exception):
     pass
@@ -37,11 +38,18 @@ class OpenFoamSimu(object):
         timeStep: str, timeStep to load. If None, load the last time step\n
         structured: bool, true if the mesh is structured\n
         dataToLoad: list of str, list containing the name of the varaibles 
-            to read and load. If None, read and load all saved variables.
+            to read and load. If None, read and load all saved variables.\n
+        workers: int, number of threads reading the files concurrently.
+            If None, chosen by concurrent.futures; 1 to read them one after
+            the other.\n
+        dtype: numpy dtype of the fields (for example float32 to halve the
+            memory used). If None, float64 for ascii files and the
+            precision of the files for binary files.
     """
 
     def __init__(self, path=None, simu=None, timeStep=None, structured=False,
-                dataToLoad=None, precision=10, order='F'):
+                dataToLoad=None, precision=10, order='F', workers=None,
+                dtype=None):
         
         if path == None and simu == None:
             # If nothing if given, consider the current directory as the 
@@ -68,22 +76,12 @@ class OpenFoamSimu(object):
 
         self.readopenfoam(timeStep=timeStep, structured=structured, 
                           dataToLoad=dataToLoad, precision=precision,
-                          order=order)
+                          order=order, workers=workers, dtype=dtype)
 
     def readmesh(self, timeStep=None, structured=False, precision=10, order='F'):
         
         if timeStep is None:
-            dir_list = os.listdir(self.directory)
-            time_list = []
-
-            for directory in dir_list:
-                try:
-                    float(directory)
-                    time_list.append(directory)
-                except:
-                    pass
-            time_list.sort(key=float)
-            timeStep = time_list[-1]
+            timeStep = getTimeIndex(self.directory).latest
 
         elif type(timeStep) is int:
             #timeStep should be in a str format
@@ -122,28 +120,22 @@ class OpenFoamSimu(object):
             self.shape = (nx, ny, nz)
 
     def readopenfoam(self, timeStep=None, structured=False, dataToLoad=None,
-                     precision=10, order='F'):
+                     precision=10, order='F', workers=None, dtype=None):
         """
         Reading SedFoam results
         Load the last time step saved of the simulation
 
         Args:
             timeStep : str or int, timeStep to load. If None, load the last time step\n
-            structured : bool, true if the mesh is structured
+            structured : bool, true if the mesh is structured\n
+            workers : None or int, number of threads reading (and
+                decompressing) the files concurrently; 1 to read them one
+                after the other\n
+            dtype : None or numpy dtype of the fields (float32 for example)
         """
 
         if timeStep is None:
-            dir_list = os.listdir(self.directory)
-            time_list = []
-
-            for directory in dir_list:
-                try:
-                    float(directory)
-                    time_list.append(directory)
-                except:
-                    pass
-            time_list.sort(key=float)
-            timeStep = time_list[-1]
+            timeStep = getTimeIndex(self.directory).latest
 
         elif type(timeStep) is int:
             #timeStep should be in a str format
@@ -161,7 +153,13 @@ class OpenFoamSimu(object):
                 if os.path.isdir(path):
                     # skip directories
                     continue
-                else:
+                # only the header is read to skip files that are not fields
+                try:
+                    type_data = OpenFoamFile(path, verbose=False,
+                                             header_only=True).type_data
+                except Exception:
+                    continue
+                if type_data in ('scalar', 'vector', 'symmtensor', 'tensor'):
                     self.variables.append(fname)
                     
             #Remove C, Cx, Cy and Cz if present
@@ -172,11 +170,21 @@ class OpenFoamSimu(object):
         else:
             self.variables = dataToLoad
 
-        for var in self.variables:
+        def read(var):
+            return OpenFoamFile(path=self.directory, time_name=self.timeStep,
+                                name = var, structured=False, precision=precision,
+                                order=order, dtype=dtype)
+
+        #The files are read (and decompressed) concurrently
+        variables = list(self.variables)
+        if workers == 1:
+            fields = map(read, variables)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fields = list(executor.map(read, variables))
+
+        for var, field in zip(variables, fields):
             #Load all variables and assign them as a variable of the object
-            field = OpenFoamFile(path=self.directory, time_name=self.timeStep,
-                                 name = var, structured=False, precision=precision,
-                                 order=order)
             values = field.values
 
             if field.type_data == "scalar":
@@ -0,0 +1,277 @@
+"""Reading decomposed OpenFoam cases with MPI
+============================================
+This module provides a class to read decomposed OpenFoam cases (processor*
+directories or collated processors/ directory) in parallel with MPI (it
+requires mpi4py). Each MPI process reads a subset of the processors of the
+case; the values can be reduced (sums, means, histograms) without being
+gathered, or gathered on one process in the order of the cells of the whole
+mesh.
+
+A script using it is run with, for example::
+
+    mpirun -n 4 python script.py
+
+.. autoclass:: MPIReader
+
+.. automethod:: MPIReader.readfield
+
+.. automethod:: MPIReader.readmesh
+
+.. automethod:: MPIReader.volumes
+
+.. automethod:: MPIReader.gather
+
+.. automethod:: MPIReader.sum
+
+.. automethod:: MPIReader.mean
+
+.. automethod:: MPIReader.histogram
+
+"""
+
+import os
+import numpy as np
+
+from fluidfoam.readof import (
+    OpenFoamFile,
+    _nb_components,
+    _processors,
+    _processor_mesh,
+    _block_centres,
+    _cell_geometry,
+)
+
+
+class MPIReader(object):
+    """
+    Read a decomposed OpenFoam case with MPI, each MPI process reading a
+    subset of the processors of the case.
+
+    The arrays returned by the methods are the values of the cells of the
+    processors read by the MPI process (cells on the last axis, as the
+    arrays returned by fluidfoam.readfield); they can be reduced with the
+    methods sum, mean and histogram, or gathered with the method gather.
+
+    Args:
+        path: str, path of the decomposed case\n
+        region: None or str\n
+        comm: None (default, MPI.COMM_WORLD) or MPI communicator\n
+        precision : Number of decimal places to round to (default: 15);
+        None to skip the rounding\n
+        verbose : True or False (default: False)
+
+    A way you might use me is:\n
+        reader = MPIReader('path_of_OpenFoam_case')
+        alpha = reader.readfield('0', 'alpha')
+        mean = reader.mean(alpha, weights=reader.volumes())
+        alpha = reader.gather(alpha)  # None on the other processes
+    """
+
+    def __init__(self, path, region=None, comm=None, precision=15,
+                 verbose=False):
+        if comm is None:
+            from mpi4py import MPI
+
+            comm = MPI.COMM_WORLD
+        self.comm = comm
+        self.path = path
+        self.region = region
+        self.precision = precision
+        self.verbose = verbose
+        if region is None:
+            self._meshpath = os.path.join("constant", "polyMesh")
+        else:
+            self._meshpath = os.path.join("constant", region, "polyMesh")
+
+        # the processors are distributed in turn over the MPI processes
+        processors = _processors(path, self._meshpath)
+        self.processors = processors[comm.Get_rank():: comm.Get_size()]
+        addressing = [
+            OpenFoamFile(
+                os.path.join(procpath, self._meshpath),
+                name="cellProcAddressing",
+                verbose=False,
+                block=block,
+            ).values
+            for procpath, block in self.processors
+        ]
+        self._sizes = [cells.size for cells in addressing]
+        #: indices in the whole mesh of the cells read by the process
+        self.cells = np.concatenate(
+            addressing + [np.empty(0, dtype=np.int64)]
+        ).astype(np.int64)
+
+    def _concatenate(self, arrays, nb_comp):
+        """Concatenate the arrays (shape (nb_cells, nb_comp)) of the
+        processors, return an array with the cells on the last axis."""
+        if not arrays:
+            values = np.empty((0, nb_comp))
+        else:
+            values = np.concatenate([
+                np.broadcast_to(array, (size, nb_comp))
+                for array, size in zip(arrays, self._sizes)
+            ])
+        if nb_comp == 1:
+            return values.ravel()
+        return values.T.copy()
+
+    def readfield(self, time_name, name, datatype=None, dtype=None):
+        """
+        Read a field in the processors of the process.
+
+        Args:
+            time_name: str\n
+            name: str\n
+            datatype: None (default) or str ("scalar", "vector"...)
+            necessary in case of files without header\n
+            dtype : None (default) or numpy dtype such as float32
+
+        Returns:
+            array: values of the cells of the processors of the process
+            (shape (nb_cells,) for scalars, (nb_comp, nb_cells) otherwise)
+        """
+        arrays = []
+        nb_comp = 1
+        for procpath, block in self.processors:
+            if self.region is not None:
+                time_path = os.path.join(time_name, self.region)
+            else:
+                time_path = time_name
+            field = OpenFoamFile(
+                procpath,
+                time_path,
+                name,
+                precision=self.precision,
+                datatype=datatype,
+                verbose=self.verbose,
+                dtype=dtype,
+                block=block,
+            )
+            nb_comp = _nb_components(field.type_data)
+            arrays.append(field.values.reshape(-1, nb_comp))
+        return self._concatenate(arrays, nb_comp)
+
+    def readmesh(self, time_name=None, geometric=False):
+        """
+        Read the centres of the cells of the processors of the process (in
+        the C file if it exists or computed from the mesh).
+
+        Args:
+            time_name: None or str\n
+            geometric : True or False (default: False); if True and if there
+            is no C file, the geometric centres (centroids) of the cells are
+            computed instead of the average of the points of the cells.
+
+        Returns:
+            array: centres of the cells (shape (3, nb_cells))
+        """
+        arrays = [
+            _block_centres(
+                procpath, block, time_name, self.region, self.precision,
+                self.verbose, geometric,
+            )
+            for procpath, block in self.processors
+        ]
+        return self._concatenate(arrays, 3)
+
+    def volumes(self):
+        """
+        Compute the volumes of the cells of the processors of the process.
+
+        Returns:
+            array: volumes of the cells (shape (nb_cells,))
+        """
+        arrays = [
+            _cell_geometry(*_processor_mesh(
+                procpath, block, self.region, self.precision, self.verbose
+            ))[1].reshape(-1, 1)
+            for procpath, block in self.processors
+        ]
+        return self._concatenate(arrays, 1)
+
+    def gather(self, values, root=0):
+        """
+        Gather the values of all the processes on the process root, in the
+        order of the cells of the whole mesh.
+
+        Args:
+            values: array returned by a method of the reader (cells on the
+            last axis)\n
+            root: int (default: 0)
+
+        Returns:
+            array: values of all the cells on the process root (None on the
+            other processes)
+        """
+        # the cells are put on the first axis to send contiguous blocks
+        values = np.ascontiguousarray(np.moveaxis(values, -1, 0))
+        counts = self.comm.gather(values.shape[0], root=root)
+        if self.comm.Get_rank() != root:
+            self.comm.Gatherv(self.cells, None, root=root)
+            self.comm.Gatherv(values, None, root=root)
+            return None
+        nb_cells = sum(counts)
+        item = int(np.prod(values.shape[1:], dtype=np.int64))
+        cells = np.empty(nb_cells, dtype=np.int64)
+        self.comm.Gatherv(self.cells, [cells, counts], root=root)
+        received = np.empty((nb_cells,) + values.shape[1:], dtype=values.dtype)
+        self.comm.Gatherv(
+            values, [received, [count * item for count in counts]], root=root
+        )
+        result = np.empty_like(received)
+        result[cells] = received
+        return np.moveaxis(result, 0, -1)
+
+    def sum(self, values, weights=None):
+        """
+        Sum the values (weighted by weights if not None) over all the cells
+        of all the processes.
+
+        Returns:
+            array: the sum, on all the processes
+        """
+        if weights is not None:
+            values = values * weights
+        return self.comm.allreduce(np.sum(values, axis=-1))
+
+    def mean(self, values, weights=None):
+        """
+        Average the values over all the cells of all the processes (weighted
+        by weights if not None, for example by the volumes of the cells).
+
+        Returns:
+            array: the mean, on all the processes
+        """
+        if weights is None:
+            weights = np.ones(values.shape[-1])
+        return self.sum(values, weights) / self.sum(weights)
+
+    def histogram(self, values, bins=10, range=None, weights=None):
+        """
+        Compute the histogram of the values of all the cells of all the
+        processes (as numpy.histogram).
+
+        Args:
+            values: array of scalars (shape (nb_cells,))\n
+            bins: int (default: 10)\n
+            range: None (default, minimum and maximum of the values of all
+            the processes) or (float, float)\n
+            weights: None or array (shape (nb_cells,))
+
+        Returns:
+            array: two arrays, the histogram and the edges of the bins, on
+            all the processes
+        """
+        if range is None:
+            from mpi4py import MPI
+
+            local = (
+                (np.min(values), np.max(values)) if values.size
+                else (np.inf, -np.inf)
+            )
+            range = (
+                self.comm.allreduce(local[0], op=MPI.MIN),
+                self.comm.allreduce(local[1], op=MPI.MAX),
+            )
+        hist, edges = np.histogram(values, bins, range, weights=weights)
+        return self.comm.allreduce(hist), edges
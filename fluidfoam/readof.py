@@ -6,6 +6,8 @@ This module provides functions to read OpenFoam Files:
 
 .. autofunction:: readfield
 
+.. autofunction:: readfields
+
 .. autofunction:: readscalar
 
 .. autofunction:: readvector
@@ -16,16 +18,39 @@ This module provides functions to read OpenFoam Files:
 
 .. autofunction:: getVolumes
 
+.. autofunction:: getPatchGeometry
+
+.. autofunction:: getTimeIndex
+
 .. autofunction:: typefield
 
+.. autofunction:: readheader
+
+.. autoclass:: MeshCache
+
+.. autoclass:: TimeIndex
+
+.. automethod:: TimeIndex.nearest
+
+.. automethod:: TimeIndex.select
+
 """
 
 
 import os
+import re
+import sys
+import json
+import threading
+import hashlib
 import gzip
-import struct
+import mmap
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import numpy as np
-import scipy.spatial as ss
 
 # define color
 W = '\033[0m'  # white (normal)
@@ -49,18 +74,467 @@ def _make_path(path, time_name=None, name=None):
     return path
 
 
-def _find_latesttime(path):
-    dir_list = os.listdir(path)
-    time_list = []
+_PARENTHESES = bytes.maketrans(b"()", b"  ")
+# first character of a number in an ascii list
+_NUMBER = re.compile(rb"[^\s()]")
 
-    for directory in dir_list:
-        try:
-            float(directory)
-            time_list.append(directory)
-        except:
-            pass
-    time_list.sort(key=float)
-    return time_list[-1]
+
+def _ascii_list(data, dtype=float):
+    """Convert the numbers of an ascii OpenFoam list into a numpy array.
+
+    The parentheses are replaced by blanks in one pass over the data and
+    all the numbers are then parsed at C speed by numpy.
+    """
+    if _NUMBER.search(data) is None:
+        # numpy would return [-1] for an empty list
+        return np.empty(0, dtype=dtype)
+    if not isinstance(data, bytes):
+        # text of a binary file read in a bytearray
+        data = bytes(data)
+    return np.fromstring(data.translate(_PARENTHESES), dtype=dtype, sep=" ")
+
+
+# a word, or one of the characters "{", "}" and ";", after blanks and comments
+_TOKEN = re.compile(rb"(?:\s+|//[^\n]*|/\*.*?\*/)*([^\s{};]+|[{};])", re.S)
+
+
+def _round(values, precision):
+    """Round values to precision decimals (no rounding if precision is None).
+
+    The rounding is done in place, except for read-only arrays (views of
+    memory-mapped files) which are copied.
+    """
+    if precision is None:
+        return values
+    if values.dtype.itemsize == 4 and precision >= 6:
+        # beyond the resolution of single precision numbers, the rounding
+        # (computed in single precision) would only add errors
+        return values
+    if values.flags.writeable:
+        return np.around(values, decimals=precision, out=values)
+    return np.around(values, decimals=precision)
+
+
+def _nb_components(type_data):
+    """Return the number of components of a type of field ("vector"...)."""
+    return {"vector": 3, "symmtensor": 6, "tensor": 9}.get(type_data, 1)
+
+
+def _read_head(f, blocksize=4096):
+    """Read the beginning of an OpenFoam file, block by block.
+
+    The reading stops as soon as the header and the beginning of the
+    internalField entry (or of the first list for other files) are read,
+    so that the data are not read.
+    """
+    content = b""
+    block = f.read(blocksize)
+    while block:
+        content += block
+        if b"FoamFile" in content:
+            end_header = content.find(b"}")
+        else:
+            end_header = 0
+        if end_header != -1:
+            pos = content.find(b"internalField", end_header)
+            if pos == -1 and not re.search(
+                rb"class\s+(vol|surface|point)\w*Field", content[:end_header]
+            ):
+                pos = end_header
+            if pos != -1 and any(
+                content.find(char, pos) != -1 for char in (b"(", b";", b"{")
+            ):
+                break
+        block = f.read(blocksize)
+    return content
+
+
+# binary format in the FoamFile header
+_BINARY = re.compile(rb"\bformat\s+binary\s*;")
+
+
+def _read_content(f, blocksize=2**20):
+    """Read a whole OpenFoam file.
+
+    Binary files are read in a bytearray, so that their values (views of
+    the content) are writable and rounded in place instead of copied.
+    """
+    head = _read_head(f)
+    if _BINARY.search(head, 0, max(head.find(b"}"), 0)) is None:
+        return head + f.read()
+    if isinstance(f, gzip.GzipFile):
+        content = bytearray(head)
+        block = f.read(blocksize)
+        while block:
+            content += block
+            block = f.read(blocksize)
+        return content
+    content = bytearray(os.fstat(f.fileno()).st_size)
+    nbytes = len(head)
+    content[:nbytes] = head
+    with memoryview(content) as view:
+        while nbytes < len(content):
+            nread = f.readinto(view[nbytes:])
+            if not nread:
+                break
+            nbytes += nread
+    del content[nbytes:]
+    return content
+
+
+# the size and the opening parenthesis of a block of a collated file
+_BLOCK = re.compile(rb"(?:\s+|//[^\n]*)*(\d+)\s*\(")
+# the FoamFile header at the beginning of a file
+_HEADER = re.compile(rb"(?:\s+|//[^\n]*|/\*.*?\*/)*FoamFile", re.S)
+# path -> (stamp of the file, offsets of its blocks)
+_block_indices = {}
+
+
+def _block_index(path):
+    """Return the offsets (start, end) of the blocks of the processors in a
+    collated (decomposedBlockData) file.
+
+    The index is made once per version of the file. The sizes of the blocks
+    are used to jump from one block to the next, so that only the pages of
+    the (memory mapped) file around the beginning of the blocks are read.
+    """
+    stamp = _file_stamp(path)
+    index = _block_indices.get(path)
+    if index is None or index[0] != stamp:
+        with open(path, "rb") as f:
+            if path.endswith(".gz"):
+                with gzip.open(f) as fgz:
+                    content = fgz.read()
+            else:
+                content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        blocks = []
+        pos = content.find(b"}") + 1
+        while True:
+            match = _BLOCK.match(content, pos)
+            if match is None:
+                break
+            start = match.end()
+            blocks.append((start, start + int(match.group(1))))
+            pos = blocks[-1][1] + 1
+        if isinstance(content, mmap.mmap):
+            content.close()
+        index = (stamp, blocks)
+        _block_indices[path] = index
+    return index[1]
+
+
+def _read_block(f, path, block):
+    """Read the content of the file of the processor number block, stored in
+    the collated file f.
+
+    Only the block is read; the header, written in the first block only, is
+    added to the other blocks.
+    """
+    blocks = _block_index(path)
+    start, end = blocks[block]
+    f.seek(start)
+    content = f.read(end - start)
+    if _HEADER.match(content) is None:
+        f.seek(blocks[0][0])
+        head = _read_head(f)
+        head = head[: head.find(b"}", head.find(b"FoamFile")) + 1]
+        content = head + b"\n" + content
+    return content
+
+
+class _Faces(Mapping):
+    """Faces stored as offsets and labels (compressed sparse rows), seen as
+    the former dict of faces: faces[i]["npts"] and faces[i]["id_pts"].
+
+    The labels of the points of the face i are labels[offsets[i]:offsets[i+1]].
+    """
+
+    def __init__(self, offsets, labels):
+        self.offsets = offsets
+        self.labels = labels
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise KeyError(i)
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return {"npts": end - start, "id_pts": self.labels[start:end]}
+
+    def __iter__(self):
+        return iter(range(len(self)))
+
+    def __len__(self):
+        return self.offsets.size - 1
+
+
+def _cell_points(offsets, labels, owner, neighbour):
+    """Return the cells and the points of the (cell, point) pairs of the mesh,
+    sorted by cell and by point, each pair being given once."""
+    npts = np.diff(offsets)
+    nb_internal = neighbour.size
+    cells = np.concatenate((
+        np.repeat(np.asarray(owner, dtype=np.int64), npts[: owner.size]),
+        np.repeat(np.asarray(neighbour, dtype=np.int64), npts[:nb_internal]),
+    ))
+    points = np.concatenate((
+        labels[: offsets[owner.size]], labels[: offsets[nb_internal]]
+    )).astype(np.int64)
+    nb_points = points.max() + 1
+    # computed in place to limit the number of temporary arrays
+    cells *= nb_points
+    cells += points
+    del points
+    pairs = np.unique(cells)
+    del cells
+    return pairs // nb_points, pairs % nb_points
+
+
+class _ParsedFile(object):
+    """Result of the parsing of an OpenFoam file by OpenFoamFile.
+
+    Only the typed arrays and the metadata of the header are kept, without
+    the content of the file and the intermediate attributes of the parser.
+    The components of the vectors and the faces are views computed on
+    demand.
+    """
+
+    __slots__ = (
+        "path",
+        "header",
+        "type_data",
+        "uniform",
+        "values",
+        "offsets",
+        "labels",
+        "nfaces",
+        "nb_faces",
+        "nb_cell",
+        "boundaryface",
+    )
+
+    def __init__(self, field):
+        for name in self.__slots__:
+            setattr(self, name, getattr(field, name, None))
+
+    def arrays(self):
+        """Return the arrays of the file."""
+        return [
+            value
+            for value in (self.values, self.offsets, self.labels)
+            if value is not None
+        ]
+
+    @property
+    def values_x(self):
+        return self.values[::3]
+
+    @property
+    def values_y(self):
+        return self.values[1::3]
+
+    @property
+    def values_z(self):
+        return self.values[2::3]
+
+    @property
+    def pointsbyface(self):
+        return self.offsets
+
+    @property
+    def faces(self):
+        return _Faces(self.offsets, self.labels)
+
+
+def _cell_centres(points, offsets, labels, owner, neighbour):
+    """Return the coordinates of the cell centres, computed as the average of
+    the points of each cell.
+
+    points is the array of the coordinates (shape (nb_points, 3)) and the
+    faces are given by offsets and labels.
+    """
+    cells, id_pts = _cell_points(offsets, labels, owner, neighbour)
+    starts = np.flatnonzero(np.diff(cells, prepend=-1))
+    counts = np.diff(starts, append=cells.size)
+    return _mean_points(points, id_pts, starts, counts)
+
+
+def _mean_points(points, id_pts, starts, counts):
+    """Return the averages (shape (3, n)) of groups of points, whose labels
+    are the counts[i] labels of id_pts starting at starts[i].
+    """
+    centres = np.empty((3, counts.size))
+    # the groups with the same number of points are averaged together, with
+    # the same summation as np.mean on the points of each group
+    for count in np.unique(counts):
+        which = np.flatnonzero(counts == count)
+        index = id_pts[(starts[which, None] + np.arange(count)).ravel()]
+        for i in range(3):
+            centres[i, which] = points[index, i].reshape(-1, count).mean(1)
+    return centres
+
+
+def _face_geometry(points, offsets, labels):
+    """Return the area vectors and the centres of the faces.
+
+    Each face is decomposed in triangles made of one of its edges and of
+    the average of its points, as done by OpenFoam.
+    """
+    npts = np.diff(offsets)
+    face_pts = points[labels]
+    estimate = np.add.reduceat(face_pts, offsets[:-1], axis=0)
+    estimate /= npts[:, None]
+    # next point of each point of the faces
+    following = np.arange(1, labels.size + 1)
+    following[offsets[1:] - 1] = offsets[:-1]
+    estimate = np.repeat(estimate, npts, axis=0)
+    normals = 0.5 * np.cross(
+        face_pts[following] - face_pts, estimate - face_pts
+    )
+    centres = face_pts + face_pts[following] + estimate
+    areas = np.sqrt((normals**2).sum(axis=1))
+    area_vectors = np.add.reduceat(normals, offsets[:-1], axis=0)
+    sum_areas = np.add.reduceat(areas, offsets[:-1])
+    face_centres = np.add.reduceat(
+        areas[:, None] * centres, offsets[:-1], axis=0
+    )
+    face_centres /= 3 * sum_areas[:, None]
+    return area_vectors, face_centres
+
+
+def _cell_geometry(points, offsets, labels, owner, neighbour):
+    """Return the geometric centres (centroids, shape (nb_cells, 3)) and the
+    volumes of the cells.
+
+    Each cell is decomposed in pyramids made of one of its faces and of the
+    average of its face centres (divergence theorem), as done by OpenFoam,
+    so that non-convex cells are supported.
+    """
+    area_vectors, face_centres = _face_geometry(points, offsets, labels)
+    nb_internal = neighbour.size
+    nb_cells = max(owner.max(), neighbour.max(initial=-1)) + 1
+    cells = np.concatenate((owner, neighbour))
+    faces = np.concatenate((np.arange(owner.size), np.arange(nb_internal)))
+
+    nb_faces = np.bincount(cells, minlength=nb_cells)
+    estimate = np.stack([
+        np.bincount(cells, weights=face_centres[faces, i], minlength=nb_cells)
+        for i in range(3)
+    ], axis=1) / nb_faces[:, None]
+
+    # 3 times the volumes of the pyramids, positive for the owner cells
+    sign = np.ones(faces.size)
+    sign[owner.size:] = -1
+    volumes = sign * np.einsum(
+        "ij,ij->i", area_vectors[faces], face_centres[faces] - estimate[cells]
+    )
+    centres = 0.75 * face_centres[faces] + 0.25 * estimate[cells]
+
+    cell_volumes = np.bincount(cells, weights=volumes, minlength=nb_cells)
+    centroids = np.stack([
+        np.bincount(cells, weights=volumes * centres[:, i], minlength=nb_cells)
+        for i in range(3)
+    ], axis=1) / cell_volumes[:, None]
+    return centroids, cell_volumes / 3
+
+
+class TimeIndex(object):
+    """Time directories of a case (or of a postProcessing directory),
+    sorted by time.
+
+    The directory is listed once with os.scandir; use getTimeIndex to get
+    an index kept until the directory is modified.
+
+    Args:
+        path: str, directory containing the time directories
+
+    A way you might use me is:\n
+        times = fluidfoam.getTimeIndex('path_of_OpenFoam_case')
+        print(times.latest, times.nearest(0.5), times.select(1, 2))
+        for time_name in times:
+            print(time_name)
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # before the listing, so that a directory created during the
+        # listing invalidates the index
+        self.mtime = os.stat(path).st_mtime_ns
+        names = []
+        times = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    time = float(entry.name)
+                except ValueError:
+                    continue
+                if entry.is_dir():
+                    names.append(entry.name)
+                    times.append(time)
+        order = np.argsort(times, kind="stable")
+        #: names of the time directories (str), sorted by time
+        self.names = [names[i] for i in order]
+        #: times of the directories (array of float)
+        self.times = np.array(times, dtype=float)[order]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    @property
+    def latest(self):
+        """Name of the last time directory (as time_name='latestTime')."""
+        return self.names[-1]
+
+    def nearest(self, time):
+        """Return the name of the time directory nearest to time (float)."""
+        if not self.names:
+            raise ValueError("No time directory in " + self.path)
+        i = np.searchsorted(self.times, time)
+        if i == len(self.names) or (
+            i > 0 and time - self.times[i - 1] <= self.times[i] - time
+        ):
+            i -= 1
+        return self.names[i]
+
+    def select(self, start=None, end=None):
+        """Return the names of the time directories whose time is between
+        start and end (included; None for no bound)."""
+        first = 0 if start is None else np.searchsorted(self.times, start)
+        last = (
+            len(self.names) if end is None
+            else np.searchsorted(self.times, end, side="right")
+        )
+        return self.names[first:last]
+
+
+_time_indices = {}
+
+
+def getTimeIndex(path):
+    """
+    Return the index of the time directories of a case (or of a
+    postProcessing directory).
+
+    The index is cached and listed again only if the modification time of
+    the directory changes (time directory created, removed or renamed).
+
+    Args:
+        path: str
+
+    Returns:
+        TimeIndex: sorted names (attribute names) and times (attribute
+        times) of the time directories
+
+    A way you might use me is:\n
+        time_name = fluidfoam.getTimeIndex('path_of_OpenFoam_case').latest
+    """
+    key = os.path.abspath(path)
+    index = _time_indices.get(key)
+    if index is None or index.mtime != os.stat(path).st_mtime_ns:
+        index = _time_indices[key] = TimeIndex(path)
+    return index
 
 
 class OpenFoamFile(object):
@@ -78,11 +552,17 @@ class OpenFoamFile(object):
         precision=15,
         datatype=None,
         verbose=True,
+        memmap=False,
+        header_only=False,
+        dtype=None,
+        cells=None,
+        keep_content=False,
+        block=None,
     ):
 
         self.pathcase = path
         if time_name == "latestTime":
-            time_name = _find_latesttime(path)
+            time_name = getTimeIndex(path).latest
         if sets is None:
             self.path = _make_path(path, time_name, name)
         else:
@@ -90,22 +570,108 @@ class OpenFoamFile(object):
         self.verbose = verbose
         if self.verbose:
             print("Reading file " + self.path)
+        # None: float64 for ascii files and the precision of the file for
+        # binary files
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        # indices (or slice) of the cells whose values are read
+        self.cells = cells
+        if cells is not None and (boundary is not None or structured):
+            raise ValueError(
+                "cells can not be used with boundary or structured"
+            )
 
         if not os.path.exists(self.path) and os.path.exists(self.path + ".gz"):
             self.path += ".gz"
 
         self.is_compressed = self.path.endswith(".gz")
+        self.is_memmap = memmap and not self.is_compressed
         if self.is_compressed:
             self._open = gzip.open
         else:
             self._open = open
 
+        is_field = name is None or not (
+            name.endswith((
+                "boundary", "faces", "points", "owner", "neighbour",
+                "ProcAddressing",
+            ))
+            or name.startswith("sets/")
+        )
+        self.streamed_values = None
         with self._open(self.path, "rb") as f:
-            self.content = f.read()
+            if block is not None:
+                # file of a processor in a collated file
+                self.content = _read_block(f, self.path, block)
+            elif header_only:
+                self.content = _read_head(f)
+            elif self.is_memmap or (
+                cells is not None and not self.is_compressed
+            ):
+                # for a subset of the cells, only the pages of the file
+                # holding their values are read
+                self.content = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            elif self.is_compressed and is_field and boundary is None:
+                self.content = _read_head(f)
+                self._parse_header()
+                self._read_stream(f, datatype)
+            else:
+                self.content = _read_content(f)
 
+        # the boundary file has no list of values: all its text is parsed
+        self._parse_header(full=name is not None and name.endswith("boundary"))
+        if self.header.get(b"class") == b"decomposedBlockData":
+            raise ValueError(
+                self.path + " is a collated file of a decomposed case: "
+                "use mode='parallel' to read it"
+            )
+
+        if header_only:
+            self._parse_head(datatype=datatype)
+        elif name is None:
+            self._parse_data(boundary=boundary,
+                             precision=precision,
+                             datatype=datatype)
+        elif name.endswith("boundary"):
+            self.boundaryface = self._parse_boundaryfile()
+        elif name.endswith("faces"):
+            self._parse_face()
+        elif name.endswith("points"):
+            self._parse_points(precision=precision)
+        elif name.endswith("owner") or name.endswith("neighbour"):
+            self._parse_owner()
+        elif name.startswith("sets/"):
+            self._parse_sets()
+        elif name.endswith("ProcAddressing"):
+            self._parse_labels()
+        else:
+            self._parse_data(boundary=boundary,
+                             precision=precision,
+                             datatype=datatype)
+        if structured and not header_only and boundary != "*":
+            self._determine_order(boundary=boundary,
+                                  order=order,
+                                  precision=precision)
+        if not keep_content:
+            # the values are parsed (binary values may still be views of
+            # the content, which is then kept alive by them)
+            self.content = None
+            self.lines_stripped = None
+
+    def _parse_header(self, full=False):
+        """Parse the header, the dimensions and the boundaryField.
+
+        Only the text outside the list of values is split in lines, unless
+        full is True.
+        """
+        if full:
+            text = bytes(self.content)
+        else:
+            text = self._text()
         self.lines_stripped = [
             line.strip().replace(b'"', b"").replace(b";", b"")
-            for line in self.content.split(b"\n")
+            for line in text.split(b"\n")
         ]
 
         self.header = self._parse_session(b"FoamFile")
@@ -118,8 +684,12 @@ class OpenFoamFile(object):
             self.noheader = True
         try:
             self.is_SP    = b"scalar=32" in self.header[b"arch"]
+            self.is_DL    = b"label=64" in self.header[b"arch"]
+            self.is_MSB   = b"MSB" in self.header[b"arch"]
         except KeyError:
             self.is_SP    = False
+            self.is_DL    = False
+            self.is_MSB   = False
 
         for line in self.lines_stripped:
             if line.startswith(b"dimensions"):
@@ -128,28 +698,114 @@ class OpenFoamFile(object):
 
         self.boundary = self._parse_session(b"boundaryField")
 
-        if name is None:
-            self._parse_data(boundary=boundary,
-                             precision=precision,
-                             datatype=datatype)
-        elif name.endswith("boundary"):
-            self.boundaryface = self._parse_boundaryfile()
-        elif name.endswith("faces"):
-            self._parse_face()
-        elif name.endswith("points"):
-            self._parse_points(precision=precision)
-        elif name.endswith("owner") or name.endswith("neighbour"):
-            self._parse_owner()
-        elif name.startswith("sets/"):
-            self._parse_sets()
+    def _read_stream(self, f, datatype, blocksize=2**20):
+        """Read the rest of a compressed file, whose beginning is in content,
+        filling directly the array of the values of the internalField.
+
+        The data are decompressed block by block and are not kept: the
+        values are set in streamed_values and the content is made of the
+        text before and after the list of values.
+        """
+        pos = self.content.find(b"internalField")
+        if pos != -1:
+            pos += len(b"internalField")
         else:
-            self._parse_data(boundary=boundary,
-                             precision=precision,
-                             datatype=datatype)
-        if structured:
-            self._determine_order(boundary=boundary,
-                                  order=order,
-                                  precision=precision)
+            pos = 0
+        nb_pts, start, data = self._parse_entry_head(pos, datatype)
+        if start == -1:
+            # uniform, codeStream or no list: nothing to stream
+            self.content += f.read()
+            return
+        nb_numbers = _nb_components(self.type_data) * nb_pts
+        head = self.content
+
+        if not self.is_ascii:
+            file_dtype = self._binary_dtype()
+            values = np.empty(nb_numbers, dtype=self._values_dtype())
+            size = nb_numbers * file_dtype.itemsize
+            if values.dtype == file_dtype:
+                buffer = values.view(np.uint8)
+            else:
+                # the numbers are converted block by block
+                buffer = np.empty(min(size, blocksize), dtype=np.uint8)
+            nbytes = min(len(head) - start, buffer.size)
+            buffer[:nbytes] = np.frombuffer(head, np.uint8, nbytes, start)
+            nb_read = 0
+            while nb_read < size:
+                nbytes_block = min(buffer.size, size - nb_read)
+                while nbytes < nbytes_block:
+                    nread = f.readinto(buffer[nbytes:nbytes_block])
+                    if not nread:
+                        raise ValueError("Unexpected end of file " + self.path)
+                    nbytes += nread
+                if values.dtype != file_dtype:
+                    index = nb_read // file_dtype.itemsize
+                    block = buffer[:nbytes_block].view(file_dtype)
+                    values[index: index + block.size] = block
+                nb_read += nbytes_block
+                nbytes = 0
+            tail = head[start + size:] + f.read()
+        else:
+            values = np.empty(nb_numbers, dtype=self._values_dtype())
+            nb_read = 0
+            text = head[start:]
+            while True:
+                # the list ends at the first ";", numbers are cut at the
+                # last end of line of each block
+                end = text.find(b";")
+                if end != -1:
+                    cut = end
+                else:
+                    block = f.read(blocksize)
+                    cut = text.rfind(b"\n") if block else len(text)
+                    if cut == -1:
+                        text += block
+                        continue
+                numbers = _ascii_list(text[:cut], values.dtype)
+                numbers = numbers[: nb_numbers - nb_read]
+                values[nb_read: nb_read + numbers.size] = numbers
+                nb_read += numbers.size
+                if end != -1:
+                    tail = text[end:] + f.read()
+                    break
+                if not block:
+                    tail = b""
+                    break
+                text = text[cut:] + block
+            values = values[:nb_read]
+
+        self.streamed_values = values
+        self.content = head[:start] + tail
+
+    def _binary_dtype(self, label=False):
+        """Return the numpy dtype of the binary numbers (given by arch)."""
+        if label:
+            dtype = np.dtype(np.int64 if self.is_DL else np.int32)
+        else:
+            dtype = np.dtype(np.float32 if self.is_SP else np.float64)
+        if self.is_MSB:
+            dtype = dtype.newbyteorder(">")
+        else:
+            dtype = dtype.newbyteorder("<")
+        return dtype
+
+    def _label_dtype(self):
+        """Return the numpy dtype of the labels of ascii files."""
+        return np.dtype(np.int64 if self.is_DL else np.int32)
+
+    def _values_dtype(self):
+        """Return the numpy dtype of the values of the fields."""
+        if self.dtype is not None:
+            return self.dtype
+        if self.is_ascii:
+            return np.dtype(float)
+        return self._binary_dtype()
+
+    def _frombuffer(self, data, nb_numbers, offset=0, label=False):
+        """View nb_numbers binary numbers of data as a numpy array (no copy)."""
+        return np.frombuffer(
+            data, dtype=self._binary_dtype(label), count=nb_numbers, offset=offset
+        )
 
     def _parse_boundaryfile(self):
 
@@ -216,49 +872,193 @@ class OpenFoamFile(object):
 
         return dict_session
 
+    def _find_list(self, pos=0):
+        """Locate the first list of numbers written after pos in the file.
+
+        Returns the size of the list and the offset of its data, i.e. of the
+        byte following the opening parenthesis ((-1, -1) if no list is found).
+        Only the bytes preceding each parenthesis are read, so that this
+        also works on memory-mapped files without reading the data.
+        """
+        content = self.content
+        ipar = content.find(b"(", pos)
+        while ipar != -1:
+            words = content[max(pos, ipar - 32): ipar].split()
+            if words and words[-1].isdigit():
+                return int(words[-1]), ipar + 1
+            ipar = content.find(b"(", ipar + 1)
+        return -1, -1
+
+    def _find_patch(self, boundary):
+        """Return the offset of the dictionary of a patch in the boundaryField.
+
+        The line of the patch name is searched from the boundaryField keyword;
+        if there is no such line but only one occurrence of the name, this
+        occurrence is used. Returns -1 if the patch is not found.
+        """
+        boun = str.encode(boundary)
+        content = self.content
+        pos = content.find(boun, max(content.rfind(b"boundaryField"), 0))
+        first = pos
+        nb_found = 0
+        while pos != -1:
+            nb_found += 1
+            line_start = content.rfind(b"\n", 0, pos) + 1
+            line_end = content.find(b"\n", pos)
+            if content[line_start:line_end].strip() == boun:
+                return pos + len(boun)
+            pos = content.find(boun, pos + 1)
+        if nb_found == 1:
+            return first + len(boun)
+        return -1
+
+    def _text(self):
+        """Return the text of the file without its list of numbers.
+
+        It is made of the beginning of the file up to the internalField
+        entry (or up to the list for mesh files), and of the boundaryField.
+        """
+        content = self.content
+        # the keyword is searched before the first list only, not in the
+        # data of the (memory-mapped) mesh files
+        first = self._find_list(max(content.find(b"}"), 0))[1]
+        end = content.find(
+            b"internalField", 0, len(content) if first == -1 else first
+        )
+        if end == -1:
+            if first == -1:
+                return bytes(content[:])
+            return bytes(content[:first])
+        start = content.rfind(b"boundaryField")
+        if start <= end:
+            return bytes(content[:end])
+        return bytes(content[:end] + b"\n" + content[start:])
+
     def _parse_data(self, boundary, datatype, precision=15):
 
-        import sys
-        if boundary is not None:
-            boun = str.encode(boundary)
-            if (np.size(self.content.split(boun))<=2):
-                iboun =1
-            else:
-                lines = self.content.split(b"\n")
-                iboun = 0
-                for line in lines:
-                    if boun in line.strip():
-                        iboun += 1
-                    if boun == line.strip():
-                        break
-
-            if iboun >= np.size(self.content.split(boun)):
-                print(R+"Error : No boundary/patch "+str(boun)+W)
+        if boundary == "*":
+            self._parse_boundaryfields(datatype=datatype, precision=precision)
+            return
+        elif boundary is not None:
+            pos = self._find_patch(boundary)
+            if pos == -1:
+                print(R+"Error : No boundary/patch "+str(str.encode(boundary))+W)
                 sys.exit(1)
 
-            elif b"value" in self.content.split(boun)[iboun].split(b"}")[0]:
-                data = self.content.split(boun)[iboun].split(b"value")[1]
-            else:
+            pos_value = self._find_value(pos)
+            if pos_value == -1:
                 if self.verbose:
                     print(R+"Warning : No data on boundary/patch")
                     print("Using the values of the nearest cells"+W)
-                self._nearest_data(boundary=boundary, precision=precision)
+                self._nearest_data(boundary, datatype, precision)
+                return
+            if self._next_token(pos_value)[0] == b"$internalField":
+                self._nearest_data(boundary, datatype, precision)
                 return
+            pos = pos_value
         else:
-            try:
-                data = self.content.split(b"internalField")[1]
-            except IndexError:
-                data = self.content
+            pos = self.content.find(b"internalField")
+            if pos != -1:
+                pos += len(b"internalField")
+            else:
+                pos = 0
+
+        if self.streamed_values is not None:
+            values = self.streamed_values
+            if self.cells is not None:
+                values = self._select(values, self.cells)
+            self.values = _round(values, precision)
+        else:
+            self.values = self._parse_entry(pos, datatype, self.cells)
+            if self.is_ascii or not self.is_memmap:
+                self.values = _round(self.values, precision)
+        if self.type_data == "vector":
+            self.values_x = self.values[::3]
+            self.values_y = self.values[1::3]
+            self.values_z = self.values[2::3]
 
-        lines = data.split(b"\n")
-        shortline = lines[0].split(b">")[-1]
-        words = lines[0].split()
+    def _parse_entry(self, pos, datatype, cells=None):
+        """Parse the field entry (internalField or value) starting at pos.
+
+        Returns the values of the entry (only those of cells if it is not
+        None); for nonuniform binary entries, it is a view of the content of
+        the file when no cells are given.
+        """
+        nb_pts, start, data = self._parse_entry_head(pos, datatype)
+        nb_numbers = _nb_components(self.type_data) * nb_pts
+        if self.uniform:
+            if self.verbose:
+                print(R+"Warning : uniform field  of type "
+                        + self.type_data + "!\n")
+                print("Only constant field in output\n"+W)
+        elif self.codestream:
+            if self.verbose:
+                print(R+"Warning : codeStream field! "
+                        + "I can not read the source code!\n"+W)
+
+        return self._entry_values(nb_numbers, start, data, cells)[0]
+
+    def _entry_values(self, nb_numbers, start, data, cells=None):
+        """Read the values of an entry whose head has been parsed.
+
+        Returns the values (only those of cells for nonuniform entries if it
+        is not None) and the offset of the end of the list of values (start
+        for uniform entries). Binary values are selected before being
+        converted, so that only the selected values are read.
+        """
+        dtype = self._values_dtype()
+        if self.uniform or self.codestream:
+            values = _ascii_list(
+                data.split(b";", 1)[0], dtype.newbyteorder("=")
+            )
+            return values[:nb_numbers], start
+        elif not self.is_ascii:
+            end = start + nb_numbers * self._binary_dtype().itemsize
+            values = self._frombuffer(self.content, nb_numbers, offset=start)
+            if cells is not None:
+                values = self._select(values, cells)
+            # no copy if the file has the asked precision
+            values = values.astype(dtype, copy=False)
+            if not values.flags.writeable and not self.is_memmap:
+                # slice of the cells in the memory-mapped file
+                values = values.copy()
+            return values, end
+        else:
+            end = self.content.find(b";", start)
+            if end == -1:
+                end = len(self.content)
+            values = _ascii_list(self.content[start:end], dtype)[:nb_numbers]
+            if cells is not None:
+                values = self._select(values, cells)
+            return values, end
+
+    def _select(self, values, cells):
+        """Return the values of the cells (indices or slice) of a list."""
+        nb_comp = _nb_components(self.type_data)
+        return values.reshape(-1, nb_comp)[cells].ravel()
+
+    def _parse_entry_head(self, pos, datatype):
+        """Parse the kind, the type and the size of the entry starting at pos.
+
+        Sets the uniform, nonuniform, codestream and type_data attributes and
+        returns the number of elements of the entry, the offset of its list of
+        values (-1 if the entry is not a list) and the text of the value for
+        uniform entries. The values themselves are not read. Other entries
+        (macros such as $internalField) raise a ValueError.
+        """
+        content = self.content
+        line_end = content.find(b"\n", pos)
+        if line_end == -1:
+            line_end = len(content)
+        line = content[pos:line_end]
+        shortline = line.split(b">")[-1]
+        words = line.split()
 
         if not self.noheader:
             self.nonuniform = words[0] == b"nonuniform"
             self.uniform = words[0] == b"uniform"
             self.codestream = words[0] == b"#codeStream"
-            self.short = shortline[-1] == b";"
+            self.short = shortline.rstrip()[-1:] == b";"
 
             self.type_data = self.header[b"class"]
 
@@ -274,192 +1074,232 @@ class OpenFoamFile(object):
             self.uniform = False
             self.codestream = False
             self.nonuniform = True
-            shortline = lines[1].split(b">")[-1]
-            self.short = shortline[-1] == b";"
+            self.short = False
             self.type_data = datatype
 
+        start = -1
+        data = b""
         if self.uniform:
             nb_pts = 1
             if not (self.type_data == "scalar"):
                 data = shortline.split(b"(")[1]
-                data = data.replace(b" ", b"\n")
-                data = data.replace(b");", b"\n);")
             else:
                 data = words[1].split(b";")[0]
-            if self.verbose:
-                print(R+"Warning : uniform field  of type "
-                        + self.type_data + "!\n")
-                print("Only constant field in output\n"+W)
-        elif shortline.count(b";") >= 1:
-            nb_pts = int(shortline.split(b"(")[0])
-            data = shortline.split(b"(")[1]
-            data = data.replace(b" ", b"\n")
-            data = data.replace(b");", b"\n);")
         elif self.codestream:
             nb_pts = 0
-            if self.verbose:
-                print(R+"Warning : codeStream field! "
-                        + "I can not read the source code!\n"+W)
+        elif self.nonuniform:
+            nb_pts, start = self._find_list(pos)
         else:
-            nb_pts = int(lines[1])
-            data = b"\n(".join(data.split(b"\n(")[1:])
-
-        if not self.is_ascii and not self.uniform:
-            if self.type_data == "scalar":
-                nb_numbers = nb_pts
-            elif self.type_data == "vector":
-                nb_numbers = 3 * nb_pts
-            elif self.type_data == "symmtensor":
-                nb_numbers = 6 * nb_pts
-            elif self.type_data == "tensor":
-                nb_numbers = 9 * nb_pts
-            if self.is_SP:
-                self.values = np.array(
-                    struct.unpack(
-                        "{}f".format(nb_numbers),
-                        data[: nb_numbers * struct.calcsize("f")],
-                    )
-                )
-            else:
-                self.values = np.array(
-                    struct.unpack(
-                        "{}d".format(nb_numbers),
-                        data[: nb_numbers * struct.calcsize("d")],
-                    )
-                )
-        else:
-            if self.type_data == "scalar":
-                self.values = np.array(
-                    [float(s) for s in data.strip().split(b"\n")[:nb_pts]]
-                )
-            elif self.type_data in ("vector", "tensor", "symmtensor"):
-                lines = data.split(b";")[0].split(b"\n(")
-                lines = [line.split(b")")[0] for line in lines]
-                data = b" ".join(lines).strip()
-                self.values = np.array([float(s) for s in data.split()])
-
-        self.values = np.around(self.values, decimals=precision)
-        if self.type_data == "vector":
-            self.values_x = self.values[::3]
-            self.values_y = self.values[1::3]
-            self.values_z = self.values[2::3]
-
-    def _nearest_data(self, boundary, precision):
-
-        bounfile = OpenFoamFile(
-            self.pathcase + "/constant/polyMesh/",
-            name="boundary",
-            verbose=self.verbose
-        )
-        ownerfile = OpenFoamFile(
-            self.pathcase + "/constant/polyMesh/",
-            name="owner",
-            verbose=self.verbose
-        )
-        id0 = int(bounfile.boundaryface[str.encode(boundary)][b"startFace"])
-        nfaces = int(bounfile.boundaryface[str.encode(boundary)][b"nFaces"])
-        cell = np.empty(nfaces, dtype=int)
-        for i in range(nfaces):
-            cell[i] = ownerfile.values[id0 + i]
-        data = self.content.split(b"internalField")[1]
-
-        lines = data.split(b"\n")
-        shortline = lines[0].split(b">")[-1]
-        words = lines[0].split()
-
-        self.nonuniform = words[0] == b"nonuniform"
-        self.uniform = words[0] == b"uniform"
-        self.codestream = words[0] == b"#codeStream"
-        self.short = shortline[-1] == b";"
-
-        self.type_data = self.header[b"class"]
-
-        if b"ScalarField" in self.type_data:
-            self.type_data = "scalar"
-        elif b"VectorField" in self.type_data:
-            self.type_data = "vector"
-        elif b"SymmTensorField" in self.type_data:
-            self.type_data = "symmtensor"
-        elif b"TensorField" in self.type_data:
-            self.type_data = "tensor"
-
-        if self.uniform:
-            nb_pts = 1
-            if not (self.type_data == "scalar"):
-                data = shortline.split(b"(")[1]
-                data = data.replace(b" ", b"\n")
-                data = data.replace(b");", b"\n);")
-            else:
-                data = words[1].split(b";")[0]
-            if self.verbose:
-                print(R+"Warning : uniform field  of type "
-                        + self.type_data + "!\n")
-                print("Only constant field in output\n"+W)
-        elif shortline.count(b";") >= 1:
-            nb_pts = int(shortline.split(b"(")[0])
-            data = shortline.split(b"(")[1]
-            data = data.replace(b" ", b"\n")
-            data = data.replace(b");", b"\n);")
-        elif self.codestream:
-            nb_pts = 0
-            if self.verbose:
-                print(R+"Warning : codeStream field! "
-                        + "I can not read the source code!\n"+W)
+            raise ValueError(
+                "Can not read the entry "
+                + bytes(line).split(b";")[0].strip().decode(errors="replace")
+                + " in " + self.path
+            )
+        return nb_pts, start, data
+
+    def _parse_head(self, datatype):
+        """Parse the type and the size of the data without reading them."""
+        pos = self.content.find(b"internalField")
+        if pos != -1:
+            self.size, dummy, dummy = self._parse_entry_head(
+                pos + len(b"internalField"), datatype
+            )
         else:
-            nb_pts = int(lines[1])
-            data = b"\n(".join(data.split(b"\n(")[1:])
-
-        if not self.is_ascii and not self.uniform:
-            if self.type_data == "scalar":
-                nb_numbers = nb_pts
-            elif self.type_data == "vector":
-                nb_numbers = 3 * nb_pts
-            elif self.type_data == "symmtensor":
-                nb_numbers = 6 * nb_pts
-            elif self.type_data == "tensor":
-                nb_numbers = 9 * nb_pts
-            if self.is_SP:
-                values = np.array(
-                    struct.unpack(
-                        "{}f".format(nb_numbers),
-                        data[: nb_numbers * struct.calcsize("f")],
+            self.uniform = False
+            self.type_data = self.header.get(b"class", datatype)
+            self.size, dummy = self._find_list(max(self.content.find(b"}"), 0))
+
+    def _parse_boundaryfields(self, datatype, precision):
+        """Parse all the patches of the boundaryField in one pass.
+
+        Sets the patches attribute: a dict patch name -> (type of the patch,
+        values on the faces of the patch). The lists of values are not
+        scanned but skipped using their size. Uniform values are expanded
+        to the number of faces of the patch and patches without value (or
+        with value $internalField) get the values of the nearest cells (as
+        with boundary=name), using the mesh of the case; None if the patch
+        is not in the mesh.
+        """
+        content = self.content
+        pos = content.find(b"internalField")
+        if pos != -1:
+            self._parse_entry_head(pos + len(b"internalField"), datatype)
+        pos = content.find(b"{", max(content.rfind(b"boundaryField"), 0)) + 1
+        entries = {}
+        while pos:
+            name, pos = self._next_token(pos)
+            if name in (None, b"}"):
+                break
+            if name.startswith(b"#"):
+                # directive such as #includeEtc
+                pos = content.find(b"\n", pos) + 1
+                continue
+            token, pos = self._next_token(pos)
+            if token != b"{":
+                pos = content.find(b";", pos) + 1
+                continue
+            type_patch = None
+            values = None
+            while pos:
+                key, pos = self._next_token(pos)
+                if key in (None, b"}"):
+                    break
+                if key.startswith(b"#"):
+                    pos = content.find(b"\n", pos) + 1
+                    continue
+                token, end = self._next_token(pos)
+                if token == b"{":
+                    pos = self._skip_dict(end)
+                elif key == b"type":
+                    type_patch = token.decode()
+                    pos = content.find(b";", pos) + 1
+                elif key == b"value" and token == b"$internalField":
+                    # expanded below as a patch without value
+                    pos = content.find(b";", pos) + 1
+                elif key == b"value":
+                    nb_pts, start, data = self._parse_entry_head(pos, datatype)
+                    values, end = self._entry_values(
+                        _nb_components(self.type_data) * nb_pts, start, data
                     )
+                    if self.is_ascii or not self.is_memmap:
+                        values = _round(values, precision)
+                    if self.uniform:
+                        values = (values,)
+                    pos = content.find(b";", max(pos, end)) + 1
+                else:
+                    pos = self._skip_entry(pos)
+            entries[name.replace(b'"', b"").decode()] = (type_patch, values)
+
+        self.patches = {}
+        internal = {}
+        for name, (type_patch, values) in entries.items():
+            if values is None or isinstance(values, tuple):
+                values = self._expand_values(
+                    name, values, datatype, precision, internal
                 )
+            self.patches[name] = (type_patch, values)
+
+    def _find_value(self, pos):
+        """Return the offset following the value keyword of the dictionary
+        of the patch whose name ends at pos (-1 if the patch has no value).
+
+        Only the keywords of the dictionary itself are considered, not the
+        words starting with value (valueFraction...) or the entries of the
+        subdictionaries.
+        """
+        content = self.content
+        token, pos = self._next_token(pos)
+        if token not in (None, b"{"):
+            # end of the name found by _find_patch (closing quote, or longer
+            # name containing the patch name)
+            token, pos = self._next_token(pos)
+        if token != b"{":
+            return -1
+        while pos:
+            key, pos = self._next_token(pos)
+            if key in (None, b"}"):
+                break
+            if key.startswith(b"#"):
+                pos = content.find(b"\n", pos) + 1
+                continue
+            if key == b"value":
+                return pos
+            token, end = self._next_token(pos)
+            if token == b"{":
+                pos = self._skip_dict(end)
             else:
-                values = np.array(
-                    struct.unpack(
-                        "{}d".format(nb_numbers),
-                        data[: nb_numbers * struct.calcsize("d")],
-                    )
-                )
-        else:
-            if self.type_data == "scalar":
-                values = np.array(
-                    [float(s) for s in data.strip().split(b"\n")[:nb_pts]]
-                )
-            elif self.type_data in ("vector", "tensor", "symmtensor"):
-                lines = data.split(b"\n(")
-                lines = [line.split(b")")[0] for line in lines]
-                data = b" ".join(lines).strip()
-                values = np.array([float(s) for s in data.split()])
-        values = np.around(values, decimals=precision)
-        if self.uniform:
-            self.values = values
-        else:
-            if self.type_data == "scalar":
-                nv = 1
-            elif self.type_data == "vector":
-                nv = 3
-            elif self.type_data == "symmtensor":
-                nv = 6
-            elif self.type_data == "tensor":
-                nv = 9
-            valuesbou = np.empty(nv * nfaces, dtype=float)
-            for i in range(nfaces):
-                valuesbou[i * nv: (i + 1) * nv] = values[
-                    nv * cell[i]: nv * (cell[i] + 1)
-                ]
-            self.values = valuesbou
+                pos = self._skip_entry(pos)
+        return -1
+
+    def _next_token(self, pos):
+        """Return the next token (word, "{", "}" or ";") after pos and the
+        offset following it (None, 0 at the end of the file)."""
+        match = _TOKEN.match(self.content, pos)
+        if match is None:
+            return None, 0
+        return match.group(1), match.end()
+
+    def _skip_dict(self, pos):
+        """Return the offset following the end of the dictionary opened
+        before pos."""
+        level = 1
+        while level:
+            token, pos = self._next_token(pos)
+            if token is None:
+                return 0
+            if token == b"{":
+                level += 1
+            elif token == b"}":
+                level -= 1
+        return pos
+
+    def _skip_entry(self, pos):
+        """Return the offset following the end of the entry at pos.
+
+        Binary nonuniform lists, which may contain any byte, are skipped
+        using their size.
+        """
+        content = self.content
+        line_end = content.find(b"\n", pos)
+        line = content[pos:line_end]
+        if b"nonuniform" in line.split(b";")[0] and not self.is_ascii:
+            nb_pts, start = self._find_list(pos)
+            match = re.search(rb"List<(\w+)>", line)
+            nb_comp = _nb_components(
+                match.group(1).decode() if match else "scalar"
+            )
+            pos = start + nb_pts * nb_comp * self._binary_dtype().itemsize
+        return content.find(b";", pos) + 1
+
+    def _expand_values(self, name, value, datatype, precision, internal):
+        """Return the values on the faces of a patch with a uniform value
+        (given as a 1-tuple) or without value (None).
+
+        internal is a dict used to read the internalField only once for all
+        the patches.
+        """
+        mesh = mesh_cache.get(self.pathcase)
+        if not os.path.exists(_make_path(mesh.meshpath, name="boundary")):
+            return None if value is None else value[0]
+        bounfile = mesh.file("boundary", self.verbose)
+        patch = bounfile.boundaryface.get(str.encode(name))
+        if patch is None:
+            return None if value is None else value[0]
+        id0 = int(patch[b"startFace"])
+        nfaces = int(patch[b"nFaces"])
+        if value is not None:
+            return np.tile(value[0], nfaces)
+
+        if not internal:
+            pos = self.content.find(b"internalField") + len(b"internalField")
+            nb_pts, start, data = self._parse_entry_head(pos, datatype)
+            values = self._entry_values(
+                _nb_components(self.type_data) * nb_pts, start, data
+            )[0]
+            internal["values"] = _round(values, precision)
+            internal["uniform"] = self.uniform
+        if internal["uniform"]:
+            return np.tile(internal["values"], nfaces)
+        nb_comp = _nb_components(self.type_data)
+        cells = mesh.file("owner", self.verbose).values[id0: id0 + nfaces]
+        return internal["values"].reshape(-1, nb_comp)[cells].ravel()
+
+    def _nearest_data(self, boundary, datatype, precision):
+        """Set the values on the faces of a patch without value to the values
+        of the cells owning them (gathered with the owner array of the
+        cached mesh)."""
+        internal = {}
+        values = self._expand_values(
+            boundary, None, datatype, precision, internal
+        )
+        if values is None:
+            raise KeyError(
+                "No boundary/patch " + boundary + " in the mesh of "
+                + self.pathcase
+            )
+        if internal["uniform"]:
+            values = internal["values"]
+        self.values = values
         if self.type_data == "vector":
             self.values_x = self.values[::3]
             self.values_y = self.values[1::3]
@@ -467,143 +1307,88 @@ class OpenFoamFile(object):
 
     def _parse_face(self):
 
-        for line in self.lines_stripped:
-            try:
-                int(line)
-                break
-            except ValueError:
-                continue
-            break
-        if not self.is_ascii:
-            self.nfaces = int(line) - 1
-        else:
-            self.nfaces = int(line)
-        data = self.content.split(line, 1)[1]
-        data = b"\n(".join(data.split(b"\n(")[1:])
-
-        lines = data.split(b"\n")
+        nb_numbers, start = self._find_list(max(self.content.find(b"}"), 0))
         self.type_data = self.header[b"class"]
-        self.faces = {}
 
         if not self.is_ascii:
-            nb_numbers = self.nfaces + 1
-            self.pointsbyface = struct.unpack(
-                "{}i".format(nb_numbers),
-                data[0: nb_numbers * struct.calcsize("i")],
+            # faceCompactList: list of offsets, then list of point labels
+            self.nfaces = nb_numbers - 1
+            self.offsets = self._frombuffer(
+                self.content, nb_numbers, offset=start, label=True
+            )
+            nb_labels, start = self._find_list(
+                start + nb_numbers * self._binary_dtype(label=True).itemsize
+            )
+            self.labels = self._frombuffer(
+                self.content, nb_labels, offset=start, label=True
             )
-            data = self.content.split(
-                str.encode(str(self.pointsbyface[-1])))[1]
-            data = b"\n(".join(data.split(b"\n(")[1:])
-
-            for i in range(self.nfaces):
-                self.faces[i] = {}
-                self.faces[i]["npts"] = self.pointsbyface[i + 1] - \
-                    self.pointsbyface[i]
-                self.faces[i]["id_pts"] = np.array(
-                    struct.unpack(
-                        "{}i".format(self.faces[i]["npts"]),
-                        data[
-                            self.pointsbyface[i]
-                            * struct.calcsize("i"): self.pointsbyface[i + 1]
-                            * struct.calcsize("i")
-                        ],
-                    )
-                )
         else:
-            for i, line in enumerate(lines):
-                if i == 0:
-                    continue
-                elif line == b")":
-                    break
-                else:
-                    self.faces[i - 1] = {}
-                    self.faces[i - 1]["npts"] = int(line.split(b"(")[0])
-                    self.faces[i - 1]["id_pts"] = [int(s) for s in
-                                                   (line.split(b"(")[1].split(b")")[0]).split()]
+            self.nfaces = nb_numbers
+            # faces are written as npts(id_0 id_1 ...), one face per line
+            end = self.content.rfind(b")")
+            tokens = _ascii_list(self.content[start:end], self._label_dtype())
+            npts = int(tokens[0]) if tokens.size else 0
+            if (tokens.size == self.nfaces * (npts + 1)
+                    and (tokens[:: npts + 1] == npts).all()):
+                self.offsets = np.arange(
+                    0, npts * self.nfaces + 1, npts, dtype=np.int64
+                )
+                self.labels = tokens.reshape(self.nfaces, npts + 1)[:, 1:]
+                self.labels = self.labels.ravel()
+            else:
+                # the number of points of each face gives the next one
+                starts = np.empty(self.nfaces, dtype=np.int64)
+                tokens_list = tokens.tolist()
+                start = 0
+                for i in range(self.nfaces):
+                    starts[i] = start
+                    start += tokens_list[start] + 1
+                self.offsets = np.zeros(self.nfaces + 1, dtype=np.int64)
+                np.cumsum(tokens[starts], out=self.offsets[1:])
+                is_label = np.ones(tokens.size, dtype=bool)
+                is_label[starts] = False
+                self.labels = tokens[is_label]
+        self.pointsbyface = self.offsets
+        self.faces = _Faces(self.offsets, self.labels)
 
     def _parse_points(self, precision):
 
-        for line in self.lines_stripped:
-            try:
-                int(line)
-                break
-            except ValueError:
-                continue
-            break
-        self.nb_pts = int(line)
-        data = self.content.split(b'}', 1)[1]
-        data = data.split(line, 1)[1]
+        self.nb_pts, start = self._find_list(max(self.content.find(b"}"), 0))
         self.type_data = self.header[b"class"]
 
         if not self.is_ascii:
-            nb_numbers = 3 * self.nb_pts
-            data = b"\n(".join(data.split(b"\n(")[1:])
-            if self.is_SP:
-                self.values = np.array(
-                    struct.unpack(
-                        "{}f".format(nb_numbers),
-                        data[: nb_numbers * struct.calcsize("f")],
-                    )
-                )
-            else:
-                self.values = np.array(
-                    struct.unpack(
-                        "{}d".format(nb_numbers),
-                        data[: nb_numbers * struct.calcsize("d")],
-                    )
-                )
+            self.values = self._frombuffer(
+                self.content, 3 * self.nb_pts, offset=start
+            )
         else:
-            lines = data.split(b"\n(")
-            lines = [line.split(b")")[0] for line in lines]
-            data = b" ".join(lines).strip()
-            self.values = np.array([float(s) for s in data.split()])
+            end = self.content.rfind(b")")
+            self.values = _ascii_list(self.content[start:end])
 
-        self.values = np.around(self.values, decimals=precision)
+        if self.is_ascii or not self.is_memmap:
+            self.values = _round(self.values, precision)
         self.values_x = self.values[::3]
         self.values_y = self.values[1::3]
         self.values_z = self.values[2::3]
 
-    def _parse_owner(self):
-
-        for line in self.lines_stripped:
-            try:
-                int(line)
-                break
-            except ValueError:
-                continue
-            break
-        try:
-            self.nb_faces = int(line)
-            data = self.content.split(line, 2)[-1]
-        # for mesh with number of cells <= 10 
-        except ValueError:
-            for line in self.lines_stripped:
-                try:
-                    line.split(b"(")
-                    int(line.split(b"(")[0])
-                    break
-                except ValueError or TypeError:
-                    continue
-                break
-            self.nb_faces = int(line.split(b"(")[0])
-            data = b"\n(" + line.split(b"(", 2)[-1]
-
+    def _parse_labels(self):
+        """Parse the list of labels of owner, neighbour and sets files."""
+        nb_numbers, start = self._find_list(max(self.content.find(b"}"), 0))
         self.type_data = self.header[b"class"]
 
         if not self.is_ascii:
-            nb_numbers = self.nb_faces
-            data = b"\n(".join(data.split(b"\n(")[1:])
-            self.values = np.array(
-                struct.unpack(
-                    "{}i".format(nb_numbers),
-                    data[: nb_numbers * struct.calcsize("i")],
-                )
+            self.values = self._frombuffer(
+                self.content, nb_numbers, offset=start, label=True
             )
         else:
-            lines = data.split(b"\n(")[1:]
-            lines = [line.split(b")")[0] for line in lines]
-            data = b" ".join(lines).strip()
-            self.values = np.array([int(s) for s in data.split()])
+            end = self.content.find(b")", start)
+            self.values = _ascii_list(
+                self.content[start:end], self._label_dtype()
+            )
+        return nb_numbers
+
+    def _parse_owner(self):
+
+        self.nb_faces = self._parse_labels()
         if self.values.min() < 0:
             self.values = self.values[np.where(self.values>=0)[0]]
             self.nb_faces = self.values.size
@@ -611,77 +1396,747 @@ class OpenFoamFile(object):
 
     def _parse_sets(self):
 
-        for line in self.lines_stripped:
-            try:
-                int(line)
-                break
-            except ValueError:
-                continue
-            break
-        self.nb_cell = int(line)
-        data = self.content.split(line, 2)[-1]
+        self.nb_cell = self._parse_labels()
 
-        self.type_data = self.header[b"class"]
+    def _determine_order(self, boundary, order, precision):
 
-        if not self.is_ascii:
-            nb_numbers = self.nb_cell
-            data = b"\n(".join(data.split(b"\n(")[1:])
-            self.values = np.array(
-                struct.unpack(
-                    "{}i".format(nb_numbers),
-                    data[: nb_numbers * struct.calcsize("i")],
-                )
-            )
+        self.ind, self.shape = _mesh_order(
+            self.pathcase, boundary, precision, self.verbose
+        )
+
+
+def _mesh_order(path, boundary, precision, verbose):
+    """Return the permutation sorting the cells (or the faces of boundary)
+    of a cartesian mesh and the shape (nx, ny, nz) of the mesh."""
+    mesh = mesh_cache.get(path, precision=precision)
+    key, centres = _read_centres(
+        mesh, path, None, boundary, None, precision, verbose, False, False
+    )
+    ind, shape = mesh.get(
+        ("order",) + key, lambda: _structured_order(*centres)
+    )
+    if np.prod(shape) != centres[0].size:
+        raise ValueError(
+            "nx.ny.nz not equal to number of cells."
+            "Are you sure that your mesh is cartesian?"
+        )
+    return ind, shape
+
+
+def _file_stamp(path):
+    """Return the modification time and the size of a file (or None)."""
+    try:
+        stat = os.stat(_make_path(path))
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _nbytes(value, seen):
+    """Return the size of the arrays of value not already in seen."""
+    if isinstance(value, np.ndarray):
+        while isinstance(value.base, np.ndarray):
+            value = value.base
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        return value.nbytes
+    elif isinstance(value, (tuple, list)):
+        return sum(_nbytes(item, seen) for item in value)
+    elif isinstance(value, dict):
+        return sum(_nbytes(item, seen) for item in value.values())
+    return 0
+
+
+def _set_readonly(value):
+    """Protect the arrays of a cached value against modifications."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _set_readonly(item)
+
+
+class _Mesh(object):
+    """Mesh files of a case, read once, and arrays derived from them.
+
+    The files are read when they are first needed, and the derived arrays
+    (cell centres, volumes, structured ordering...) are computed once and
+    stored with a key.
+    """
+
+    names = ("owner", "neighbour", "faces", "boundary")
+
+    def __init__(self, meshpath, pointpath, precision, memmap, cache):
+        self.meshpath = meshpath
+        self.pointpath = pointpath
+        self.precision = precision
+        self.memmap = memmap
+        self.stamp = self._stamp()
+        self._cache = cache
+        # shared with the cache, whose size is computed from all the meshes
+        self._lock = cache._lock
+        self._files = {}
+        self._derived = {}
+
+    def _stamp(self):
+        stamp = [
+            _file_stamp(os.path.join(self.meshpath, name))
+            for name in self.names
+        ]
+        stamp.append(_file_stamp(os.path.join(self.pointpath, "points")))
+        return tuple(stamp)
+
+    def file(self, name, verbose=True):
+        """Return the parsed mesh file ("owner", "points"...), as a
+        _ParsedFile."""
+        with self._lock:
+            field = self._files.get(name)
+        if field is None:
+            if name == "points":
+                path = self.pointpath
+            else:
+                path = self.meshpath
+            # read without the lock, so that several meshes (processors of
+            # a decomposed case) can be read by concurrent threads
+            field = _ParsedFile(OpenFoamFile(
+                path,
+                name=name,
+                precision=self.precision,
+                verbose=verbose,
+                memmap=self.memmap,
+            ))
+            _set_readonly(field.arrays())
+            with self._lock:
+                field = self._files.setdefault(name, field)
+                self._cache._shrink()
+        return field
+
+    def get(self, key, compute):
+        """Return the derived value of key, computed with compute() once
+        (or loaded from the disk cache)."""
+        with self._lock:
+            if key in self._derived:
+                return self._derived[key]
+        value = self._cache._load(self, key)
+        if value is None:
+            value = compute()
+            self._cache._save(self, key, value)
+        _set_readonly(value)
+        with self._lock:
+            value = self._derived.setdefault(key, value)
+            self._cache._shrink()
+        return value
+
+    @property
+    def nbytes(self):
+        """Size of the arrays kept by the mesh."""
+        seen = set()
+        with self._lock:
+            return sum(
+                _nbytes(field.arrays(), seen)
+                for field in self._files.values()
+            ) + _nbytes(self._derived, seen)
+
+
+class MeshCache(object):
+    """In-process cache of the meshes read by fluidfoam.
+
+    The files of the meshes (owner, neighbour, faces, points, boundary) and
+    the arrays derived from them (cell centres, volumes, structured ordering)
+    are kept between the calls of readmesh, getVolumes, readfield with
+    structured=True or with a boundary without value and MeshVisu. A mesh is
+    read again if one of its files is modified (modification time or size).
+
+    The least recently used meshes are dropped when the size of the kept
+    arrays exceeds maxsize (in bytes, 0 disables the cache).
+
+    The derived arrays can also be saved on disk, as uncompressed .npy
+    files, to be loaded (memory-mapped) by the next Python sessions instead
+    of being computed again: directory is None (default, no disk cache),
+    True to save them in a .fluidfoam directory next to the polyMesh
+    directory, or the path of a cache directory. They are used only if the
+    modification times and the sizes of the mesh files have not changed.
+
+    A way you might use me is:\n
+        fluidfoam.mesh_cache.maxsize = 4 * 2**30  # 4 GiB
+        fluidfoam.mesh_cache.directory = True
+        fluidfoam.mesh_cache.clear()
+
+    """
+
+    def __init__(self, maxsize=2**30, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self._meshes = OrderedDict()
+        # the meshes are got and read by concurrent threads (for example
+        # the processors of a decomposed case)
+        self._lock = threading.RLock()
+
+    def get(self, path, time_name=None, region=None, precision=15,
+            memmap=False):
+        """Return the mesh of a case (points of time_name if not None)."""
+        if region is None:
+            meshpath = os.path.join(path, "constant", "polyMesh")
         else:
-            lines = data.split(b"\n(")[1:]
-            lines = [line.split(b")")[0] for line in lines]
-            data = b" ".join(lines).strip()
-            self.values = np.array([int(s) for s in data.split()])
+            meshpath = os.path.join(path, "constant", region, "polyMesh")
+        pointpath = meshpath
+        if time_name is not None and region is None:
+            if time_name == "latestTime":
+                time_name = getTimeIndex(path).latest
+            pointpath = os.path.join(path, time_name, "polyMesh")
+        key = (
+            os.path.abspath(meshpath),
+            os.path.abspath(pointpath),
+            precision,
+            memmap,
+        )
+        with self._lock:
+            mesh = self._meshes.pop(key, None)
+            if mesh is None or mesh.stamp != mesh._stamp():
+                mesh = _Mesh(meshpath, pointpath, precision, memmap, self)
+            self._meshes[key] = mesh
+            self._shrink()
+        return mesh
+
+    @property
+    def nbytes(self):
+        """Size of the arrays kept in the cache."""
+        with self._lock:
+            return sum(mesh.nbytes for mesh in self._meshes.values())
+
+    def clear(self):
+        """Drop all the meshes of the cache."""
+        with self._lock:
+            self._meshes.clear()
+
+    def _shrink(self):
+        with self._lock:
+            while self._meshes and self.nbytes > self.maxsize:
+                self._meshes.popitem(last=False)
+
+    def _disk_path(self, mesh, key):
+        """Return the path (without extension) of the files of a derived
+        value in the disk cache (None if there is no disk cache)."""
+        if self.directory is None or self.directory is False:
+            return None
+        if self.directory is True:
+            directory = os.path.join(os.path.dirname(mesh.meshpath), ".fluidfoam")
+        else:
+            directory = self.directory
+        name = repr((
+            os.path.abspath(mesh.meshpath),
+            os.path.abspath(mesh.pointpath),
+            mesh.precision,
+            key,
+        ))
+        return os.path.join(
+            directory, hashlib.sha1(name.encode()).hexdigest()[:20]
+        )
 
-    def _determine_order(self, boundary, order, precision):
+    def _load(self, mesh, key):
+        """Return a derived value from the disk cache (None if it is not
+        there or if the mesh files have changed)."""
+        path = self._disk_path(mesh, key)
+        if path is None or not os.path.exists(path + ".json"):
+            return None
+        try:
+            with open(path + ".json") as f:
+                info = json.load(f)
+            if info["stamp"] != json.loads(json.dumps(mesh.stamp)):
+                return None
+            value = []
+            for i, kind in enumerate(info["items"]):
+                item = np.asarray(
+                    np.load("{}_{}.npy".format(path, i), mmap_mode="r")
+                )
+                if kind == "tuple":
+                    item = tuple(int(number) for number in item)
+                value.append(item)
+        except (OSError, ValueError, KeyError):
+            return None
+        return tuple(value)
+
+    def _save(self, mesh, key, value):
+        """Save a derived value (tuple of arrays and of tuples of integers)
+        in the disk cache; nothing is done if it can not be written."""
+        path = self._disk_path(mesh, key)
+        if path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            items = []
+            for i, item in enumerate(value):
+                items.append("tuple" if isinstance(item, tuple) else "array")
+                with open("{}_{}.npy.tmp".format(path, i), "wb") as f:
+                    np.save(f, np.asarray(item))
+                os.replace(
+                    "{}_{}.npy.tmp".format(path, i), "{}_{}.npy".format(path, i)
+                )
+            # written last, so that the arrays are complete when it exists
+            with open(path + ".json.tmp", "w") as f:
+                json.dump(
+                    {"key": repr(key), "stamp": mesh.stamp, "items": items}, f
+                )
+            os.replace(path + ".json.tmp", path + ".json")
+        except OSError:
+            pass
 
-        xs, ys, zs = readmesh(
-            self.pathcase,
-            boundary=boundary,
+
+mesh_cache = MeshCache()
+
+
+def _structured_order(xs, ys, zs):
+    """Return the permutation sorting the cells of a cartesian mesh and the
+    shape (nx, ny, nz) of the mesh.
+
+    The coordinates are rounded to 12 significant digits of the size of the
+    mesh (whatever the precision of the reading), so that the round-off
+    errors of the computed centres do not split the rows of cells.
+    """
+    size = max(np.ptp(coords) for coords in (xs, ys, zs)) if xs.size else 0
+    decimals = 12 - int(np.floor(np.log10(size))) if size > 0 else 12
+    xs, ys, zs = (np.round(coords, decimals) for coords in (xs, ys, zs))
+    shape = (np.unique(xs).size, np.unique(ys).size, np.unique(zs).size)
+    return np.lexsort((xs, ys, zs)), shape
+
+
+def _patch_faces(mesh, boundary, verbose):
+    """Return the index of the first face and the number of faces of a
+    patch of the mesh."""
+    bounfile = mesh.file("boundary", verbose)
+    patch = bounfile.boundaryface[str.encode(boundary)]
+    return int(patch[b"startFace"]), int(patch[b"nFaces"])
+
+
+def _read_centres(mesh, path, time_name, boundary, region, precision,
+                  verbose, memmap, geometric):
+    """Return the key in the mesh and the coordinates of the centres of the
+    cells (or of the faces of a boundary), read in the C file if it exists
+    or computed from the mesh."""
+    if boundary is not None:
+        key = ("boundary", boundary)
+
+        def compute():
+            facefile = mesh.file("faces", verbose)
+            pointfile = mesh.file("points", verbose)
+            id0, nfaces = _patch_faces(mesh, boundary, verbose)
+            offsets = facefile.offsets[id0: id0 + nfaces + 1]
+            return tuple(_mean_points(
+                pointfile.values.reshape(-1, 3), facefile.labels,
+                offsets[:-1], np.diff(offsets)
+            ))
+
+        return key, mesh.get(key, compute)
+
+    if time_name is None and region is None:
+        cpath = _make_path(path, "constant", "C")
+    elif time_name is not None and region is None:
+        cpath = _make_path(path, time_name, "C")
+    else:
+        cpath = None
+    if cpath is not None and os.path.exists(cpath):
+        key = ("C", cpath, _file_stamp(cpath))
+
+        def compute():
+            return tuple(readvector(
+                cpath, precision=precision, verbose=verbose, memmap=memmap
+            ))
+
+        return key, mesh.get(key, compute)
+
+    key = ("centres", geometric)
+
+    def compute():
+        owner = mesh.file("owner", verbose)
+        facefile = mesh.file("faces", verbose)
+        pointfile = mesh.file("points", verbose)
+        neigh = mesh.file("neighbour", verbose)
+        points = pointfile.values.reshape(-1, 3)
+        if geometric:
+            centroids = _cell_geometry(
+                points, facefile.offsets, facefile.labels,
+                owner.values, neigh.values
+            )[0]
+            return tuple(centroids.T.copy())
+        return tuple(_cell_centres(
+            points, facefile.offsets, facefile.labels,
+            owner.values, neigh.values
+        ))
+
+    return key, mesh.get(key, compute)
+
+
+def _processors(path, meshpath):
+    """Return the processors of a decomposed case, as a list of (directory,
+    block) with the index of the block of the processor in the files of a
+    collated case (processors/ directory), or None."""
+    names = [
+        name for name in os.listdir(path)
+        if re.fullmatch(r"processor\d+", name)
+    ]
+    if names:
+        names.sort(key=lambda name: int(name[len("processor"):]))
+        return [(os.path.join(path, name), None) for name in names]
+    names = [
+        name for name in os.listdir(path)
+        if re.fullmatch(r"processors\d*", name)
+    ]
+    if not names:
+        raise ValueError("No processor directory in " + path)
+    # collated case: one block per processor in each file
+    procpath = os.path.join(path, names[0])
+    blocks = _block_index(
+        _make_path(os.path.join(procpath, meshpath), name="cellProcAddressing")
+    )
+    return [(procpath, block) for block in range(len(blocks))]
+
+
+def _map(function, items, workers=None):
+    """Return the list of the results of function for the items, computed
+    one after the other (workers == 1), by workers if it is an executor of
+    concurrent.futures, or in a pool of workers threads."""
+    if workers == 1:
+        return [function(item) for item in items]
+    if isinstance(workers, Executor):
+        return list(workers.map(function, items))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, items))
+
+
+class _SharedArray(object):
+    """Array in a block of shared memory (multiprocessing.shared_memory),
+    allocated by the parent process of a pool, in which the processes of
+    the pool write their values in place (see _write_shared).
+
+    np.asarray(shared) is a view of the block which keeps it alive: the
+    block is freed when the arrays viewing it are deleted (once unlink has
+    been called).
+    """
+
+    def __init__(self, shape, dtype):
+        from multiprocessing import shared_memory
+
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        # a block of shared memory can not be empty
+        self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.name = self._shm.name
+        self._array = np.ndarray(shape, dtype, buffer=self._shm.buf)
+        self.__array_interface__ = self._array.__array_interface__
+
+    def unlink(self):
+        """Remove the name of the block, when the processes have written
+        in it (its memory is freed with the last view)."""
+        from multiprocessing import resource_tracker
+
+        if sys.version_info < (3, 13) and os.name == "posix":
+            # the workers sharing the resource tracker of this process have
+            # unregistered the block (see _attach)
+            resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
+
+    def __del__(self):
+        if getattr(self, "_shm", None) is not None:
+            self._array = None
+            self._shm.close()
+
+
+def _attach(name):
+    """Attach a block of shared memory created by the parent process of a
+    pool, without registering it in the resource tracker: the block is
+    freed by the parent process."""
+    from multiprocessing import resource_tracker, shared_memory
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == "posix":
+        # before Python 3.13, the attached blocks are registered, and the
+        # resource tracker of a worker freed them (with warnings) at its exit
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _write_shared(task):
+    """Compute read(*args) in a process of a pool and write it in place at
+    index in the array (of shape and dtype, starting at offset) of a block
+    of shared memory."""
+    read, args, name, offset, shape, dtype, index = task
+    values = read(*args)
+    shm = _attach(name)
+    try:
+        array = np.ndarray(shape, dtype, buffer=shm.buf, offset=offset)
+        array[index] = values
+        del array
+    finally:
+        shm.close()
+
+
+def _map_shared(executor, tasks, shared):
+    """Run the tasks (see _write_shared) in the processes of executor and
+    unlink the block of shared memory where they write, once all of them
+    are done."""
+    futures = [executor.submit(_write_shared, task) for task in tasks]
+    wait(futures)
+    shared.unlink()
+    for future in futures:
+        future.result()
+
+
+def _addressing(meshpath, processor):
+    """Return the cellProcAddressing of a processor (directory, block)."""
+    procpath, block = processor
+    return OpenFoamFile(
+        os.path.join(procpath, meshpath),
+        name="cellProcAddressing",
+        verbose=False,
+        block=block,
+    ).values
+
+
+def _read_processor(meshpath, read, processor):
+    """Return the cellProcAddressing and the values read by read of a
+    processor."""
+    return _addressing(meshpath, processor), np.asarray(read(*processor))
+
+
+def _reconstruct(path, region, read, workers=None, layout=None):
+    """Read the processors of a decomposed case concurrently and scatter
+    their values in one array, in the order of the cells of the whole mesh.
+
+    read(processor directory, block) returns an array whose first axis is
+    the cells of the processor (or of length 1 for a uniform value); the
+    cellProcAddressing files give the indices of these cells in the whole
+    mesh. The processors are written in processor* directories or, for
+    collated cases, in blocks of the files of a processors/ directory.
+
+    If workers is a ProcessPoolExecutor, read has to be picklable and the
+    processes write the values of the processors in place in an array in
+    shared memory, whose layout (shape of the values of a cell, dtype) has
+    to be given.
+    """
+    if region is None:
+        meshpath = os.path.join("constant", "polyMesh")
+    else:
+        meshpath = os.path.join("constant", region, "polyMesh")
+    processors = _processors(path, meshpath)
+    if isinstance(workers, ProcessPoolExecutor):
+        addressing = _map(partial(_addressing, meshpath), processors)
+        item_shape, dtype = layout
+        shape = (sum(cells.size for cells in addressing),) + tuple(item_shape)
+        shared = _SharedArray(shape, dtype)
+        _map_shared(workers, [
+            (read, processor, shared.name, 0, shape, np.dtype(dtype).str,
+             cells)
+            for processor, cells in zip(processors, addressing)
+        ], shared)
+        return np.asarray(shared)
+
+    results = _map(partial(_read_processor, meshpath, read), processors, workers)
+    nb_cells = sum(addressing.size for addressing, dummy in results)
+    values = results[0][1]
+    values = np.empty((nb_cells,) + values.shape[1:], dtype=values.dtype)
+    for addressing, proc_values in results:
+        values[addressing] = proc_values
+    return values
+
+
+class _ProcessorField(object):
+    """Reader of a field in the processors of a decomposed case, which can
+    be sent to the processes of a pool. The type of the field is kept in
+    the attribute type_data."""
+
+    def __init__(self, time_name, name, **kwargs):
+        self.time_name = time_name
+        self.name = name
+        self.kwargs = kwargs
+        self.type_data = None
+
+    def __call__(self, procpath, block):
+        field = OpenFoamFile(
+            procpath, self.time_name, self.name, block=block, **self.kwargs
+        )
+        self.type_data = field.type_data
+        return field.values.reshape(-1, _nb_components(field.type_data))
+
+
+def _processor_centres(procpath, block, time_name, region, precision,
+                       verbose, memmap, geometric):
+    """Return the centres of the cells (shape (nb_cells, 3)) of a processor
+    (directory or block of a collated case)."""
+    if block is not None:
+        return _block_centres(
+            procpath, block, time_name, region, precision, verbose, geometric
+        )
+    return np.stack(readmesh(
+        procpath, time_name, region=region, precision=precision,
+        verbose=verbose, memmap=memmap, geometric=geometric,
+    ), axis=1)
+
+
+def _block_centres(path, block, time_name, region, precision, verbose,
+                   geometric):
+    """Return the centres of the cells (shape (nb_cells, 3)) of the processor
+    stored in the blocks number block of a collated case, read in the C
+    file if it exists or computed from the mesh."""
+    if time_name is None and region is None:
+        cpath = _make_path(path, "constant", "C")
+    elif time_name is not None and region is None:
+        cpath = _make_path(path, time_name, "C")
+    else:
+        cpath = None
+    if cpath is not None and os.path.exists(cpath):
+        return OpenFoamFile(
+            cpath, precision=precision, verbose=verbose, block=block
+        ).values.reshape(-1, 3)
+
+    mesh = _processor_mesh(path, block, region, precision, verbose)
+    if geometric:
+        return _cell_geometry(*mesh)[0]
+    return _cell_centres(*mesh).T
+
+
+def _processor_mesh(path, block, region, precision, verbose):
+    """Return the points (shape (nb_points, 3)), the faces (offsets and
+    labels), the owner and the neighbour arrays of the mesh of a processor
+    (directory path or block of a collated case)."""
+    if region is None:
+        meshpath = os.path.join(path, "constant", "polyMesh")
+    else:
+        meshpath = os.path.join(path, "constant", region, "polyMesh")
+
+    def read(name):
+        return OpenFoamFile(
+            meshpath, name=name, precision=precision, verbose=verbose,
+            block=block,
+        )
+
+    facefile = read("faces")
+    return (
+        read("points").values.reshape(-1, 3),
+        facefile.offsets,
+        facefile.labels,
+        read("owner").values,
+        read("neighbour").values,
+    )
+
+
+class _DecomposedField(object):
+    """Field of a decomposed case, read in the processor directories and
+    reconstructed in the order of the cells of the whole mesh.
+
+    It has the attributes of OpenFoamFile used by the readers: values
+    (flat), type_data, uniform and, if structured, ind and shape.
+    """
+
+    def __init__(self, path, time_name, name, structured, sets, region,
+                 precision, datatype, verbose, memmap, dtype, workers):
+        read = _ProcessorField(
+            time_name,
+            name,
+            sets=sets,
             precision=precision,
-            verbose=self.verbose
+            datatype=datatype,
+            verbose=verbose,
+            memmap=memmap,
+            dtype=dtype,
         )
-        nb_cell = xs.size
-        nx = np.unique(xs).size
-        ny = np.unique(ys).size
-        nz = np.unique(zs).size
-        if nx * ny * nz != nb_cell:
-            raise ValueError(
-                "nx.ny.nz not equal to number of cells."
-                "Are you sure that your mesh is cartesian?"
+        layout = None
+        if isinstance(workers, ProcessPoolExecutor):
+            # the processors are read by the processes of a pool: the layout
+            # of the values is read in the header of the first processor
+            if region is None:
+                meshpath = os.path.join("constant", "polyMesh")
+            else:
+                meshpath = os.path.join("constant", region, "polyMesh")
+            procpath, block = _processors(path, meshpath)[0]
+            head = OpenFoamFile(
+                procpath, time_name, name, sets=sets, datatype=datatype,
+                verbose=False, header_only=True, block=block, dtype=dtype,
+            )
+            read.type_data = head.type_data
+            layout = ((_nb_components(head.type_data),), head._values_dtype())
+        self.values = _reconstruct(path, region, read, workers, layout).ravel()
+        self.type_data = read.type_data
+        self.uniform = False
+        if structured:
+            xs, ys, zs = readmesh(
+                path, region=region, precision=precision, verbose=verbose,
+                mode="parallel", workers=workers,
             )
+            self.ind, self.shape = _structured_order(xs, ys, zs)
+
+
+def typefield(path, time_name=None, name=None, verbose=True):
+    """Read OpenFoam field and returns type of field.
+
+    Args:
+        path: str\n
+        time_name: str ('latestTime' is supported)\n
+        name: str
+
+    Returns:
+        str: type of field
+
+    A way you might use me is:\n
+        print("type of alpha field is",
+        fluidfoam.typefield('path_of_OpenFoam_case', '0', 'alpha'))
+
+    """
 
-        self.ind = np.lexsort((xs, ys, zs))
-        self.shape = (nx, ny, nz)
+    path = _make_path(path, time_name, name)
 
+    field = OpenFoamFile(path, verbose=verbose, header_only=True)
 
-def typefield(path, time_name=None, name=None, verbose=True):
-    """Read OpenFoam field and returns type of field.
+    return field.type_data
+
+
+def readheader(path, time_name=None, name=None, verbose=True):
+    """Read only the beginning of an OpenFoam file and returns its header.
+
+    Only the first blocks of the file (compressed or not) are read, up to the
+    size of the internalField, so that the data are not read.
 
     Args:
         path: str\n
         time_name: str ('latestTime' is supported)\n
-        name: str
+        name: str\n
+        verbose : True or False (default: True).
 
     Returns:
-        str: type of field
+        dict: with keys "class", "format" and "arch" (str or None if not
+        written), "dimensions" (tuple or None), "type" (type of field:
+        "scalar", "vector", "symmtensor" or "tensor"), "size" (number of
+        values of the internalField, or of the list for mesh files) and
+        "uniform" (True if the internalField is uniform)
 
     A way you might use me is:\n
-        print("type of alpha field is",
-        fluidfoam.typefield('path_of_OpenFoam_case', '0', 'alpha'))
+        header = fluidfoam.readheader('path_of_OpenFoam_case', '0', 'U')
+        print(header["class"], header["size"])
 
     """
 
-    path = _make_path(path, time_name, name)
+    field = OpenFoamFile(
+        path, time_name, name, verbose=verbose, header_only=True
+    )
 
-    field = OpenFoamFile(path, verbose=verbose)
+    def _decode(key):
+        value = field.header.get(key)
+        return value.decode() if value is not None else None
 
-    return field.type_data
+    type_data = field.type_data
+    if isinstance(type_data, bytes):
+        type_data = type_data.decode()
+    return {
+        "class": _decode(b"class"),
+        "format": _decode(b"format"),
+        "arch": _decode(b"arch"),
+        "dimensions": getattr(field, "dimensions", None),
+        "type": type_data,
+        "size": field.size,
+        "uniform": field.uniform,
+    }
 
 
 def readfield(
@@ -696,6 +2151,11 @@ def readfield(
     precision=15,
     datatype=None,
     verbose=True,
+    memmap=False,
+    dtype=None,
+    cells=None,
+    mode=None,
+    workers=None,
 ):
     """
     Read OpenFoam field and reshape if necessary (structured mesh) and
@@ -706,66 +2166,268 @@ def readfield(
         time_name: str ('latestTime' is supported)\n
         name: str\n
         structured: False or True\n
-        boundary: None or str\n
+        boundary: None or str; "*" to read all the patches of the
+        boundaryField in one pass\n
         sets: None or str\n
         region: None or str\n
         order: "F" (default) or "C" \n
-        precision : Number of decimal places to round to (default: 15)\n
+        precision : Number of decimal places to round to (default: 15);
+        None to skip the rounding\n
         datatype: None (default) or str ("scalar", "vector"...) necessary in
         case of files without header\n
-        verbose : True or False (default: True).
+        verbose : True or False (default: True)\n
+        memmap : True or False (default: False); if True, the file is
+        mapped in memory instead of being read, and binary values are a
+        read-only view of the file (precision is then not applied).\n
+        dtype : None (default: float64 for ascii files and the precision
+        of the file for binary files) or numpy dtype such as float32; the
+        values are decoded directly with this dtype.\n
+        cells : None (default) or array of indices (or slice) of the cells
+        whose values are read; for uncompressed binary files, only these
+        values are read from the file (not with boundary or structured).\n
+        mode : None (default) or "parallel" to read a decomposed case in its
+        processor* directories, without reconstructPar (not with boundary
+        or cells)\n
+        workers : None (default, number of threads chosen by
+        concurrent.futures), int, number of threads reading the processor
+        directories with mode="parallel", or executor of concurrent.futures;
+        with a ProcessPoolExecutor, the processes write the values in
+        shared memory.
 
     Returns:
         array: array of type of the field; size of the array is the size of the
         interior domain (or of the size of the boundary in case of not None
-        boundary)
+        boundary)\n
+        dict: if boundary is "*", dict patch name -> (type of the patch, array
+        of the values on the patch); uniform values are expanded to the size
+        of the patch and patches without value get the values of the
+        nearest cells (None if the patch is not in the mesh)
 
     A way you might use me is:\n
         field = fluidfoam.readfield('path_of_OpenFoam_case', '0', 'alpha')
+        patches = fluidfoam.readfield('path_of_OpenFoam_case', '0', 'U',
+                                      boundary="*")
     """
 
-    if region is not None:
-        sets = region
-    field = OpenFoamFile(
+    if mode == "parallel":
+        if boundary is not None or cells is not None:
+            raise ValueError(
+                "boundary and cells are not implemented with mode='parallel'"
+            )
+        field = _DecomposedField(
+            path, time_name, name, structured, region or sets, region,
+            precision, datatype, verbose, memmap, dtype, workers,
+        )
+    else:
+        if region is not None:
+            sets = region
+        field = OpenFoamFile(
+            path,
+            time_name,
+            name,
+            structured=structured,
+            boundary=boundary,
+            sets=sets,
+            order=order,
+            precision=precision,
+            datatype=datatype,
+            verbose=verbose,
+            memmap=memmap,
+            dtype=dtype,
+            cells=cells,
+        )
+    if boundary == "*":
+        return _patch_values(field, order)
+
+    if structured and not field.uniform:
+        return _shape_values(
+            field.values, field.type_data, order, field.ind, field.shape
+        )
+    return _shape_values(field.values, field.type_data, order)
+
+
+def _patch_values(field, order):
+    """Return the dict patch name -> (type of the patch, values) of a field
+    read with boundary="*", the values being shaped as by readfield."""
+    nb_comp = _nb_components(field.type_data)
+    patches = {}
+    for patch, (type_patch, values) in field.patches.items():
+        if values is not None and nb_comp > 1:
+            shape = (nb_comp, values.size // nb_comp)
+            values = np.reshape(values, shape, order=order)
+        patches[patch] = (type_patch, values)
+    return patches
+
+
+def _shape_values(values, type_data, order, ind=None, shape=None):
+    """Reshape the flat values of a field as returned by readfield: shape
+    (nb_comp, nb_cells) except for scalars, and ordered and reshaped with
+    the permutation ind and the shape of a structured mesh if ind is not
+    None."""
+    if type_data == "scalar":
+        if ind is not None:
+            values = np.reshape(values[ind], shape, order=order)
+    elif type_data in ("vector", "symmtensor", "tensor"):
+        nb_comp = _nb_components(type_data)
+        values = np.reshape(
+            values, (nb_comp, values.size // nb_comp), order=order
+        )
+        if ind is not None:
+            values = values[:, ind]
+            values = np.reshape(
+                values, (nb_comp,) + tuple(shape), order=order
+            )
+    return values
+
+
+def readfields(
+    path,
+    time_name=None,
+    names=None,
+    structured=False,
+    sets=None,
+    region=None,
+    order="F",
+    precision=15,
+    verbose=True,
+    memmap=False,
+    dtype=None,
+    workers=None,
+):
+    """
+    Read several OpenFoam fields of a time directory concurrently.
+
+    The files are read and decompressed (for .gz files) in a pool of
+    threads, zlib and most of the numpy conversions releasing the GIL, or
+    in the processes of a ProcessPoolExecutor given as workers (for ascii
+    files, whose parsing holds the GIL).
+
+    Args:
+        path: str\n
+        time_name: str ('latestTime' is supported)\n
+        names: None (default, all the fields of the time directory) or list
+        of str\n
+        structured: False or True\n
+        sets: None or str\n
+        region: None or str\n
+        order: "F" (default) or "C" \n
+        precision : Number of decimal places to round to (default: 15);
+        None to skip the rounding\n
+        verbose : True or False (default: True)\n
+        memmap : True or False (default: False)\n
+        dtype : None (default: float64 for ascii files and the precision
+        of the file for binary files) or numpy dtype such as float32; the
+        values are decoded directly with this dtype\n
+        workers : None (default, number of threads chosen by
+        concurrent.futures), int (with 1, the files are read one after the
+        other) or executor of concurrent.futures; with a
+        ProcessPoolExecutor, the processes write the fields in place
+        in shared memory instead of pickling them.
+
+    Returns:
+        dict: name of the field -> array, as returned by readfield
+
+    A way you might use me is:\n
+        fields = fluidfoam.readfields('path_of_OpenFoam_case', '0',
+                                      ['alpha', 'U'], workers=4)
+    """
+
+    if time_name == "latestTime":
+        time_name = getTimeIndex(path).latest
+    if names is None:
+        names = []
+        if region is not None:
+            sets = region
+        dirpath = os.path.join(
+            path, *[name for name in (time_name, sets) if name is not None]
+        )
+        for fname in sorted(os.listdir(dirpath)):
+            fpath = os.path.join(dirpath, fname)
+            if os.path.isdir(fpath):
+                continue
+            try:
+                type_data = OpenFoamFile(
+                    fpath, verbose=False, header_only=True
+                ).type_data
+            except Exception:
+                continue
+            if type_data in ("scalar", "vector", "symmtensor", "tensor"):
+                if fname.endswith(".gz"):
+                    fname = fname[:-3]
+                names.append(fname)
+
+    read = partial(
+        readfield,
         path,
         time_name,
-        name,
         structured=structured,
-        boundary=boundary,
         sets=sets,
+        region=region,
         order=order,
         precision=precision,
-        datatype=datatype,
         verbose=verbose,
+        memmap=memmap,
+        dtype=dtype,
     )
-    values = field.values
-
-    if field.type_data == "scalar":
-        if structured and not field.uniform:
-            values = np.reshape(values[field.ind], field.shape, order=order)
-    elif field.type_data == "vector":
-        shape = (3, values.size // 3)
-        values = np.reshape(values, shape, order=order)
-        if structured and not field.uniform:
-            values[0:3, :] = values[0:3, field.ind]
-            shape = (3,) + tuple(field.shape)
-            values = np.reshape(values, shape, order=order)
-    elif field.type_data == "symmtensor":
-        shape = (6, values.size // 6)
-        values = np.reshape(values, shape, order=order)
-        if structured and not field.uniform:
-            values[0:6, :] = values[0:6, field.ind]
-            shape = (6,) + tuple(field.shape)
-            values = np.reshape(values, shape, order=order)
-    elif field.type_data == "tensor":
-        shape = (9, values.size // 9)
-        values = np.reshape(values, shape, order=order)
-        if structured and not field.uniform:
-            values[0:9, :] = values[0:9, field.ind]
-            shape = (9,) + tuple(field.shape)
-            values = np.reshape(values, shape, order=order)
+    if isinstance(workers, ProcessPoolExecutor):
+        return _readfields_shared(
+            path, time_name, names, structured, region or sets, order,
+            precision, verbose, memmap, dtype, workers,
+        )
+    return dict(zip(names, _map(read, names, workers)))
 
-    return values
+
+def _file_values(path, time_name, name, **kwargs):
+    """Return the flat values of a field file."""
+    return OpenFoamFile(path, time_name, name, **kwargs).values
+
+
+def _readfields_shared(path, time_name, names, structured, sets, order,
+                       precision, verbose, memmap, dtype, workers):
+    """Read fields in the processes of a ProcessPoolExecutor, which write
+    their values in place in one block of shared memory allocated with the
+    sizes given by the headers of the files."""
+    heads = [
+        OpenFoamFile(
+            path, time_name, name, sets=sets, verbose=False,
+            header_only=True, dtype=dtype,
+        )
+        for name in names
+    ]
+    layout = []
+    nbytes = 0
+    for head in heads:
+        count = _nb_components(head.type_data)
+        if not head.uniform:
+            count *= head.size
+        field_dtype = np.dtype(head._values_dtype())
+        # the fields are aligned on 16 bytes in the block
+        nbytes += -nbytes % 16
+        layout.append((nbytes, count, field_dtype))
+        nbytes += count * field_dtype.itemsize
+    shared = _SharedArray((nbytes,), np.uint8)
+    read = partial(
+        _file_values, path, time_name, sets=sets, precision=precision,
+        verbose=verbose, memmap=memmap, dtype=dtype,
+    )
+    _map_shared(workers, [
+        (read, (name,), shared.name, offset, (count,), field_dtype.str,
+         Ellipsis)
+        for name, (offset, count, field_dtype) in zip(names, layout)
+    ], shared)
+
+    buffer = np.asarray(shared)
+    fields = {}
+    for name, head, (offset, count, field_dtype) in zip(names, heads, layout):
+        values = buffer[offset:offset + count * field_dtype.itemsize]
+        values = values.view(field_dtype)
+        if structured and not head.uniform:
+            ind, shape = _mesh_order(path, None, precision, verbose)
+            values = _shape_values(values, head.type_data, order, ind, shape)
+        else:
+            values = _shape_values(values, head.type_data, order)
+        fields[name] = values
+    return fields
 
 
 def readscalar(
@@ -780,6 +2442,10 @@ def readscalar(
     precision=15,
     mode=None,
     verbose=True,
+    memmap=False,
+    dtype=None,
+    cells=None,
+    workers=None,
 ):
     """
     Read OpenFoam scalar field and reshape if necessary and possible (not
@@ -790,17 +2456,38 @@ def readscalar(
         time_name: str ('latestTime' is supported)\n
         name: str\n
         structured: False or True\n
-        boundary: None or str\n
+        boundary: None or str; "*" to read all the patches of the
+        boundaryField in one pass\n
         sets: None or str\n
         region: None or str\n
         order: "F" (default) or "C" \n
-        precision : Number of decimal places to round to (default: 15)\n
-        verbose : True or False (default: True).
+        precision : Number of decimal places to round to (default: 15);
+        None to skip the rounding\n
+        verbose : True or False (default: True)\n
+        memmap : True or False (default: False); if True, the file is
+        mapped in memory instead of being read, and binary values are a
+        read-only view of the file (precision is then not applied).\n
+        dtype : None (default: float64 for ascii files and the precision
+        of the file for binary files) or numpy dtype such as float32; the
+        values are decoded directly with this dtype.\n
+        cells : None (default) or array of indices (or slice) of the cells
+        whose values are read; for uncompressed binary files, only these
+        values are read from the file (not with boundary or structured).\n
+        mode : None (default) or "parallel" to read a decomposed case in its
+        processor* directories, without reconstructPar (not with boundary
+        or cells)\n
+        workers : None (default, number of threads chosen by
+        concurrent.futures), int, number of threads reading the processor
+        directories with mode="parallel", or executor of concurrent.futures;
+        with a ProcessPoolExecutor, the processes write the values in
+        shared memory.
 
     Returns:
         array: array of scalar field; size of the array is the size of the
         interior domain (or of the size of the boundary in case of not None
-        boundary)
+        boundary)\n
+        dict: if boundary is "*", dict patch name -> (type of the patch, array
+        of the values on the patch), as returned by readfield
 
     A way you might use me is:\n
         scalar_a = fluidfoam.readscalar('path_of_OpenFoam_case', '0', 'alpha')
@@ -809,7 +2496,24 @@ def readscalar(
     if region is not None:
         sets = region
     if mode == "parallel":
-        raise ValueError("Not Implemented")
+        values = readfield(
+            path,
+            time_name,
+            name,
+            structured=structured,
+            boundary=boundary,
+            sets=sets,
+            region=region,
+            order=order,
+            precision=precision,
+            datatype="scalar",
+            verbose=verbose,
+            memmap=memmap,
+            dtype=dtype,
+            cells=cells,
+            mode=mode,
+            workers=workers,
+        )
     else:
         scalar = OpenFoamFile(
             path,
@@ -822,12 +2526,17 @@ def readscalar(
             precision=precision,
             datatype="scalar",
             verbose=verbose,
+            memmap=memmap,
+            dtype=dtype,
+            cells=cells,
         )
-        values = scalar.values
-
         if scalar.type_data != "scalar":  # pragma: no cover
             raise ValueError("This file does not contain a scalar.")
 
+        if boundary == "*":
+            return _patch_values(scalar, order)
+
+        values = scalar.values
         if structured:
             values = values[scalar.ind].reshape(scalar.shape, order=order)
 
@@ -845,6 +2554,11 @@ def readvector(
     order="F",
     precision=15,
     verbose=True,
+    memmap=False,
+    dtype=None,
+    cells=None,
+    mode=None,
+    workers=None,
 ):
     """
     Read OpenFoam vector field and reshape if necessary and possible (not
@@ -855,22 +2569,62 @@ def readvector(
         time_name: str ('latestTime' is supported)\n
         name: str\n
         structured: False or True\n
-        boundary: None or str\n
+        boundary: None or str; "*" to read all the patches of the
+        boundaryField in one pass\n
         sets: None or str\n
         region: None or str\n
         order: "F" (default) or "C" \n
-        precision : Number of decimal places to round to (default: 15)\n
-        verbose : True or False (default: True).
+        precision : Number of decimal places to round to (default: 15);
+        None to skip the rounding\n
+        verbose : True or False (default: True)\n
+        memmap : True or False (default: False); if True, the file is
+        mapped in memory instead of being read, and binary values are a
+        read-only view of the file (precision is then not applied).\n
+        dtype : None (default: float64 for ascii files and the precision
+        of the file for binary files) or numpy dtype such as float32; the
+        values are decoded directly with this dtype.\n
+        cells : None (default) or array of indices (or slice) of the cells
+        whose values are read; for uncompressed binary files, only these
+        values are read from the file (not with boundary or structured).\n
+        mode : None (default) or "parallel" to read a decomposed case in its
+        processor* directories, without reconstructPar (not with boundary
+        or cells)\n
+        workers : None (default, number of threads chosen by
+        concurrent.futures), int, number of threads reading the processor
+        directories with mode="parallel", or executor of concurrent.futures;
+        with a ProcessPoolExecutor, the processes write the values in
+        shared memory.
 
     Returns:
         array: array of vector field; size of the array is the size of the
         interior domain (or of the size of the boundary in case of not None
-        boundary)
+        boundary)\n
+        dict: if boundary is "*", dict patch name -> (type of the patch, array
+        of the values on the patch), as returned by readfield
 
     A way you might use me is:\n
         U = fluidfoam.readvector('path_of_OpenFoam_case', '0', 'U')
     """
 
+    if mode == "parallel":
+        return readfield(
+            path,
+            time_name,
+            name,
+            structured=structured,
+            boundary=boundary,
+            sets=sets,
+            region=region,
+            order=order,
+            precision=precision,
+            datatype="vector",
+            verbose=verbose,
+            memmap=memmap,
+            dtype=dtype,
+            cells=cells,
+            mode=mode,
+            workers=workers,
+        )
     if region is not None:
         sets = region
     vector = OpenFoamFile(
@@ -884,19 +2638,24 @@ def readvector(
         precision=precision,
         datatype="vector",
         verbose=verbose,
+        memmap=memmap,
+        dtype=dtype,
+        cells=cells,
     )
-    values = vector.values
-
     if vector.type_data != "vector":  # pragma: no cover
         raise ValueError("This file does not contain a vector.")
 
+    if boundary == "*":
+        return _patch_values(vector, order)
+
+    values = vector.values
     shape = (3, values.size // 3)
     values = np.reshape(values, shape, order=order)
     if structured:
         if vector.uniform and verbose:
             print("internalfield is uniform; so no reshape possible...")
         else:
-            values[0:3, :] = values[0:3, vector.ind]
+            values = values[:, vector.ind]
             shape = (3,) + tuple(vector.shape)
             values = np.reshape(values, shape, order=order)
 
@@ -914,6 +2673,11 @@ def readsymmtensor(
     order="F",
     precision=15,
     verbose=True,
+    memmap=False,
+    dtype=None,
+    cells=None,
+    mode=None,
+    workers=None,
 ):
     """
     Read OpenFoam symmetrical tensor field and reshape if necessary and
@@ -924,22 +2688,62 @@ def readsymmtensor(
         time_name: str ('latestTime' is supported)\n
         name: str\n
         structured: False or True\n
-        boundary: None or str\n
+        boundary: None or str; "*" to read all the patches of the
+        boundaryField in one pass\n
         sets: None or str\n
         region: None or str\n
         order: "F" (default) or "C" \n
-        precision : Number of decimal places to round to (default: 15)\n
-        verbose : True or False (default: True).
+        precision : Number of decimal places to round to (default: 15);
+        None to skip the rounding\n
+        verbose : True or False (default: True)\n
+        memmap : True or False (default: False); if True, the file is
+        mapped in memory instead of being read, and binary values are a
+        read-only view of the file (precision is then not applied).\n
+        dtype : None (default: float64 for ascii files and the precision
+        of the file for binary files) or numpy dtype such as float32; the
+        values are decoded directly with this dtype.\n
+        cells : None (default) or array of indices (or slice) of the cells
+        whose values are read; for uncompressed binary files, only these
+        values are read from the file (not with boundary or structured).\n
+        mode : None (default) or "parallel" to read a decomposed case in its
+        processor* directories, without reconstructPar (not with boundary
+        or cells)\n
+        workers : None (default, number of threads chosen by
+        concurrent.futures), int, number of threads reading the processor
+        directories with mode="parallel", or executor of concurrent.futures;
+        with a ProcessPoolExecutor, the processes write the values in
+        shared memory.
 
     Returns:
         array: array of symmetrical tensor field; size of the array is the size
         of the interior domain (or of the size of the boundary in case of not
-        None boundary)
+        None boundary)\n
+        dict: if boundary is "*", dict patch name -> (type of the patch, array
+        of the values on the patch), as returned by readfield
 
     A way you might use me is:\n
         sigma = fluidfoam.readsymmtensor('path_of_OpenFoam_case', '0', 'sigma')
     """
 
+    if mode == "parallel":
+        return readfield(
+            path,
+            time_name,
+            name,
+            structured=structured,
+            boundary=boundary,
+            sets=sets,
+            region=region,
+            order=order,
+            precision=precision,
+            datatype="symmtensor",
+            verbose=verbose,
+            memmap=memmap,
+            dtype=dtype,
+            cells=cells,
+            mode=mode,
+            workers=workers,
+        )
     if region is not None:
         sets = region
     scalar = OpenFoamFile(
@@ -953,19 +2757,24 @@ def readsymmtensor(
         precision=precision,
         datatype="symmtensor",
         verbose=verbose,
+        memmap=memmap,
+        dtype=dtype,
+        cells=cells,
     )
-    values = scalar.values
-
     if scalar.type_data != "symmtensor":  # pragma: no cover
         raise ValueError("This file does not contain a symmtensor.")
 
+    if boundary == "*":
+        return _patch_values(scalar, order)
+
+    values = scalar.values
     shape = (6, values.size // 6)
     values = np.reshape(values, shape, order=order)
     if structured:
         if scalar.uniform and verbose:
             print("internalfield is uniform; so no reshape possible...")
         else:
-            values[0:6, :] = values[0:6, scalar.ind]
+            values = values[:, scalar.ind]
             shape = (6,) + tuple(scalar.shape)
             values = np.reshape(values, shape, order=order)
 
@@ -983,6 +2792,11 @@ def readtensor(
     order="F",
     precision=15,
     verbose=True,
+    memmap=False,
+    dtype=None,
+    cells=None,
+    mode=None,
+    workers=None,
 ):
     """
     Read OpenFoam tensor field and reshape if necessary and possible
@@ -993,22 +2807,62 @@ def readtensor(
         time_name: str ('latestTime' is supported)\n
         name: str\n
         structured: False or True\n
-        boundary: None or str\n
+        boundary: None or str; "*" to read all the patches of the
+        boundaryField in one pass\n
         sets: None or str\n
         region: None or str\n
         order: "F" (default) or "C" \n
-        precision : Number of decimal places to round to (default: 15)\n
-        verbose : True or False (default: True).
+        precision : Number of decimal places to round to (default: 15);
+        None to skip the rounding\n
+        verbose : True or False (default: True)\n
+        memmap : True or False (default: False); if True, the file is
+        mapped in memory instead of being read, and binary values are a
+        read-only view of the file (precision is then not applied).\n
+        dtype : None (default: float64 for ascii files and the precision
+        of the file for binary files) or numpy dtype such as float32; the
+        values are decoded directly with this dtype.\n
+        cells : None (default) or array of indices (or slice) of the cells
+        whose values are read; for uncompressed binary files, only these
+        values are read from the file (not with boundary or structured).\n
+        mode : None (default) or "parallel" to read a decomposed case in its
+        processor* directories, without reconstructPar (not with boundary
+        or cells)\n
+        workers : None (default, number of threads chosen by
+        concurrent.futures), int, number of threads reading the processor
+        directories with mode="parallel", or executor of concurrent.futures;
+        with a ProcessPoolExecutor, the processes write the values in
+        shared memory.
 
     Returns:
         array: array of tensor field; size of the array is the size of the
         interior domain (or of the size of the boundary in case of not None
-        boundary)
+        boundary)\n
+        dict: if boundary is "*", dict patch name -> (type of the patch, array
+        of the values on the patch), as returned by readfield
 
     A way you might use me is:\n
         tens = fluidfoam.readtensor('path_of_OpenFoam_case', '0', 'tens')
     """
 
+    if mode == "parallel":
+        return readfield(
+            path,
+            time_name,
+            name,
+            structured=structured,
+            boundary=boundary,
+            sets=sets,
+            region=region,
+            order=order,
+            precision=precision,
+            datatype="tensor",
+            verbose=verbose,
+            memmap=memmap,
+            dtype=dtype,
+            cells=cells,
+            mode=mode,
+            workers=workers,
+        )
     if region is not None:
         sets = region
     scalar = OpenFoamFile(
@@ -1022,20 +2876,25 @@ def readtensor(
         precision=precision,
         datatype="tensor",
         verbose=verbose,
+        memmap=memmap,
+        dtype=dtype,
+        cells=cells,
     )
 
-    values = scalar.values
-
     if scalar.type_data != "tensor":  # pragma: no cover
         raise ValueError("This file does not contstartFaceain a tensor.")
 
+    if boundary == "*":
+        return _patch_values(scalar, order)
+
+    values = scalar.values
     shape = (9, values.size // 9)
     values = np.reshape(values, shape, order=order)
     if structured:
         if scalar.uniform and verbose:
             print("internalfield is uniform; so no reshape possible...")
         else:
-            values[0:9, :] = values[0:9, scalar.ind]
+            values = values[:, scalar.ind]
             shape = (9,) + tuple(scalar.shape)
             values = np.reshape(values, shape, order=order)
 
@@ -1051,7 +2910,11 @@ def readmesh(
     region=None,
     order="F",
     precision=15,
-    verbose=True
+    verbose=True,
+    memmap=False,
+    geometric=False,
+    mode=None,
+    workers=None,
 ):
     """
     Read OpenFoam mesh and reshape if necessary (in cartesian structured mesh).
@@ -1064,8 +2927,23 @@ def readmesh(
         sets: None or str\n
         region: None or str\n
         order: "F" (default) or "C" \n
-        precision : Number of decimal places to round to (default: 15)\n
-        verbose : True or False (default: True).
+        precision : Number of decimal places to round to (default: 15);
+        None to skip the rounding\n
+        verbose : True or False (default: True)\n
+        memmap : True or False (default: False); if True, the mesh files are
+        mapped in memory instead of being read (precision is then not
+        applied to binary points)\n
+        geometric : True or False (default: False); if True and if there is
+        no C file, the geometric centres (centroids) of the cells are
+        computed instead of the average of the points of the cells.\n
+        mode : None (default) or "parallel" to read the mesh of a
+        decomposed case in its processor* directories (not with boundary
+        or sets)\n
+        workers : None (default, number of threads chosen by
+        concurrent.futures), int, number of threads reading the processor
+        directories with mode="parallel", or executor of concurrent.futures;
+        with a ProcessPoolExecutor, the processes write the values in
+        shared memory.
 
     Returns:
         array: array of vector (Mesh X, Y, Z); size of the array is the size of
@@ -1088,6 +2966,30 @@ def readmesh(
     # because in dynamic Mesh cases, no polyMesh directory for initial time
     if time_name == "0":
         time_name = None
+    if mode == "parallel":
+        if boundary is not None or sets is not None:
+            raise ValueError(
+                "boundary and sets are not implemented with mode='parallel'"
+            )
+        read = partial(
+            _processor_centres, time_name=time_name, region=region,
+            precision=precision, verbose=verbose, memmap=memmap,
+            geometric=geometric,
+        )
+        xs, ys, zs = _reconstruct(
+            path, region, read, workers, ((3,), np.float64)
+        ).T.copy()
+        if structured:
+            ind, shape = _structured_order(xs, ys, zs)
+            if np.prod(shape) != xs.size:
+                raise ValueError(
+                    "nx.ny.nz not equal to number of cells."
+                    "Are you sure that your mesh is cartesian?"
+                )
+            xs = xs[ind].reshape(shape, order=order)
+            ys = ys[ind].reshape(shape, order=order)
+            zs = zs[ind].reshape(shape, order=order)
+        return xs, ys, zs
     if region is None:
         meshpath = "/constant/polyMesh/"
     else:
@@ -1099,110 +3001,17 @@ def readmesh(
             " Please verify the directory of your case.",
         )
 
-    if boundary is not None:
-        facefile = OpenFoamFile(
-            path + meshpath, name="faces", verbose=verbose
-        )
-        if time_name is not None:
-            pointfile = OpenFoamFile(
-                path=path,
-                time_name=time_name,
-                name="polyMesh/points",
-                precision=precision,
-                verbose=verbose
-            )
-        else:
-            pointfile = OpenFoamFile(
-                path + meshpath,
-                name="points",
-                precision=precision,
-                verbose=verbose
-            )
-        bounfile = OpenFoamFile(
-            path + meshpath,
-            name="boundary",
-            verbose=verbose
-        )
-        id0 = int(bounfile.boundaryface[str.encode(boundary)][b"startFace"])
-        nmesh = int(bounfile.boundaryface[str.encode(boundary)][b"nFaces"])
-
-        xs = np.empty(nmesh, dtype=float)
-        ys = np.empty(nmesh, dtype=float)
-        zs = np.empty(nmesh, dtype=float)
-
-        for i in range(nmesh):
-            npts = int(facefile.faces[id0 + i]["npts"])
-            id_pts = np.zeros(npts, dtype=int)
-            id_pts[0:npts] = facefile.faces[id0 + i]["id_pts"][0:npts]
-            xs[i] = np.mean(pointfile.values_x[id_pts[0:npts]])
-            ys[i] = np.mean(pointfile.values_y[id_pts[0:npts]])
-            zs[i] = np.mean(pointfile.values_z[id_pts[0:npts]])
-    else:
-        if (time_name is None and region is None
-                and os.path.exists(os.path.join(path, "constant/C"))):
-            xs, ys, zs = readvector(
-                path, "constant", "C", precision=precision, verbose=verbose
-            )
-            nmesh = np.size(xs)
-        elif (time_name is not None and region is None
-              and os.path.exists(_make_path(path, time_name, "C"))):
-            xs, ys, zs = readvector(
-                path, time_name, "C", precision=precision, verbose=verbose
-            )
-            nmesh = np.size(xs)
-        else:
-            owner = OpenFoamFile(
-                path + meshpath, name="owner", verbose=verbose
-            )
-            nmesh = owner.nb_cell
-            facefile = OpenFoamFile(
-                path + meshpath, name="faces", verbose=verbose
-            )
-            if time_name is not None and region is None:
-                pointfile = OpenFoamFile(
-                    path=path,
-                    time_name=time_name,
-                    name="polyMesh/points",
-                    precision=precision,
-                    verbose=verbose
-                )
-            else:
-                pointfile = OpenFoamFile(
-                    path + meshpath,
-                    name="points",
-                    precision=precision,
-                    verbose=verbose
-                )
-            neigh = OpenFoamFile(
-                path + meshpath, name="neighbour", verbose=verbose
-            )
-            xs = np.empty(owner.nb_cell, dtype=float)
-            ys = np.empty(owner.nb_cell, dtype=float)
-            zs = np.empty(owner.nb_cell, dtype=float)
-            face = {}
-            for i in range(neigh.nb_faces):
-                if not neigh.values[i] in face:
-                    face[neigh.values[i]] = list()
-                face[neigh.values[i]].append(facefile.faces[i]["id_pts"][:])
-            for i in range(owner.nb_faces):
-                if not owner.values[i] in face:
-                    face[owner.values[i]] = list()
-                face[owner.values[i]].append(facefile.faces[i]["id_pts"][:])
-            for i in range(owner.nb_cell):
-                xs[i] = np.mean(
-                    pointfile.values_x[np.unique(np.concatenate(face[i])[:])]
-                )
-                ys[i] = np.mean(
-                    pointfile.values_y[np.unique(np.concatenate(face[i])[:])]
-                )
-                zs[i] = np.mean(
-                    pointfile.values_z[np.unique(np.concatenate(face[i])[:])]
-                )
+    mesh = mesh_cache.get(path, time_name, region, precision, memmap)
+    key, (xs, ys, zs) = _read_centres(
+        mesh, path, time_name, boundary, region, precision, verbose, memmap,
+        geometric
+    )
+    nmesh = xs.size
     if structured:
-        nx = np.unique(xs).size
-        ny = np.unique(ys).size
-        nz = np.unique(zs).size
-        if nx * ny * nz != nmesh:
+        ind, shape = mesh.get(
+            ("order",) + key, lambda: _structured_order(xs, ys, zs)
+        )
+        if np.prod(shape) != nmesh:
             raise ValueError(
                 "nx.ny.nz not equal to number of cells."
                 "Are you sure that your mesh is cartesian?"
@@ -1210,18 +3019,20 @@ def readmesh(
                 "For example : "
                 "fluidfoam.readmesh(case, True, precision=13)"
             )
-        ind = np.lexsort((xs, ys, zs))
-        shape = (nx, ny, nz)
         xs = xs[ind].reshape(shape, order=order)
         ys = ys[ind].reshape(shape, order=order)
         zs = zs[ind].reshape(shape, order=order)
+    else:
+        # the arrays of the cache are not returned
+        xs, ys, zs = xs.copy(), ys.copy(), zs.copy()
     if sets is not None:
-        setsfile = OpenFoamFile(
+        setsfile = _ParsedFile(OpenFoamFile(
             path=path+meshpath,
             name="sets/"+sets,
             precision=precision,
-            verbose=verbose
-        )
+            verbose=verbose,
+            memmap=memmap,
+        ))
         xs = xs[setsfile.values]
         ys = ys[setsfile.values]
         zs = zs[setsfile.values]
@@ -1254,7 +3065,8 @@ def getVolumes(
         sets: None or str\n
         region: None or str\n
         order: "F" (default) or "C" \n
-        precision : Number of decimal places to round to (default: 15)\n
+        precision : Number of decimal places to round to (default: 15);
+        None to skip the rounding\n
         verbose : True or False (default: True)
         box : tuple of box's dimension: ((xmin, ymin, zmin), (xmax, ymax, zmax))\n
                (if None, includes the whole mesh)\n
@@ -1282,44 +3094,8 @@ def getVolumes(
             " Please verify the directory of your case.",
         )
 
-    owner = OpenFoamFile(
-        path + meshpath, name="owner", verbose=verbose
-    )
-    nmesh = owner.nb_cell
-    facefile = OpenFoamFile(
-        path + meshpath, name="faces", verbose=verbose
-    )
-    if time_name is not None and region is None:
-        pointfile = OpenFoamFile(
-            path=path,
-            time_name=time_name,
-            name="polyMesh/points",
-            precision=precision,
-            verbose=verbose
-        )
-    else:
-        pointfile = OpenFoamFile(
-            path + meshpath,
-            name="points",
-            precision=precision,
-            verbose=verbose
-        )
-    neigh = OpenFoamFile(
-        path + meshpath, name="neighbour", verbose=verbose
-    )
-    xs = np.empty(owner.nb_cell, dtype=float)
-    ys = np.empty(owner.nb_cell, dtype=float)
-    zs = np.empty(owner.nb_cell, dtype=float)
-    face = {}
-    for i in range(neigh.nb_faces):
-        if not neigh.values[i] in face:
-            face[neigh.values[i]] = list()
-        face[neigh.values[i]].append(facefile.faces[i]["id_pts"][:])
-    for i in range(owner.nb_faces):
-        if not owner.values[i] in face:
-            face[owner.values[i]] = list()
-        face[owner.values[i]].append(facefile.faces[i]["id_pts"][:])
-
+    mesh = mesh_cache.get(path, time_name, region, precision)
+    pointfile = mesh.file("points", verbose)
     if box != None:
         # box = ((xmin, ymin, zmin), (xmax, ymax, zmax))
         if len(box[0]) != 3 or len(box[1]) != 3:
@@ -1333,35 +3109,39 @@ def getVolumes(
         maxz = np.max(pointfile.values_z)
         box = ((minx, miny, minz), (maxx, maxy, maxz))
 
-    centroidCell = np.empty((0,3), dtype=float)
-    VolCell_all = np.empty(owner.nb_cell, dtype=float)
-
-    for i in range(owner.nb_cell):
-        xs[i] = np.mean(
-            pointfile.values_x[np.unique(np.concatenate(face[i])[:])]
-        )
-        ys[i] = np.mean(
-            pointfile.values_y[np.unique(np.concatenate(face[i])[:])]
-        )
-        zs[i] = np.mean(
-            pointfile.values_z[np.unique(np.concatenate(face[i])[:])]
+    def compute():
+        owner = mesh.file("owner", verbose)
+        facefile = mesh.file("faces", verbose)
+        neigh = mesh.file("neighbour", verbose)
+        return _cell_geometry(
+            pointfile.values.reshape(-1, 3), facefile.offsets,
+            facefile.labels, owner.values, neigh.values
         )
 
-        if box[0][0] < xs[i] < box[1][0] and box[0][1] < ys[i] < box[1][1] and box[0][2] < zs[i] < box[1][2]:
-            pointsCell=[]
-            for k in zip(np.unique(np.concatenate(face[i])[:])):
-                pointsCell.append([pointfile.values_x[k],pointfile.values_y[k],pointfile.values_z[k]])
-
-            # Add 3D elements into the empty array
-            element = np.array([xs[i], ys[i], zs[i]])
-            centroidCell = np.append(centroidCell, [element], axis=0)
-            VolCell_all[i]=ss.ConvexHull(pointsCell).volume
-    VolCell = VolCell_all[VolCell_all != 0]
+    centroids, volumes = mesh.get(("geometry",), compute)
+    in_box = np.all(
+        (np.array(box[0]) < centroids) & (centroids < np.array(box[1])),
+        axis=1
+    )
+    centroidCell = centroids[in_box]
+    VolCell = volumes[in_box]
+    nmesh = VolCell.size
     if structured:
-        nx = np.unique(xs).size
-        ny = np.unique(ys).size
-        nz = np.unique(zs).size
-        if nx * ny * nz != nmesh:
+        # the same centres as readmesh, without the rounding errors of the
+        # centroids
+        key, centres = _read_centres(
+            mesh, path, time_name, None, region, precision, verbose, False,
+            False
+        )
+        if in_box.all():
+            ind, shape = mesh.get(
+                ("order",) + key, lambda: _structured_order(*centres)
+            )
+        else:
+            ind, shape = _structured_order(
+                *[coord[in_box] for coord in centres]
+            )
+        if np.prod(shape) != nmesh:
             raise ValueError(
                 "nx.ny.nz not equal to number of cells."
                 "Are you sure that your mesh is cartesian?"
@@ -1369,12 +3149,84 @@ def getVolumes(
                 "For example : "
                 "fluidfoam.readmesh(case, True, precision=13)"
             )
-        ind = np.lexsort((xs, ys, zs))
-        shape = (nx, ny, nz)
         VolCell = VolCell[ind].reshape(shape, order=order)
     return centroidCell,VolCell
 
 
+def getPatchGeometry(
+    path,
+    boundary,
+    time_name=None,
+    region=None,
+    precision=15,
+    verbose=True,
+):
+    """
+    Reads OpenFoam mesh and returns the geometry of the faces of a boundary
+    patch, as computed by OpenFoam (Cf, Sf and magSf), for example to
+    compute surface integrals.
+
+    Args:
+        path: str\n
+        boundary: str\n
+        time_name: str ('latestTime' is supported)\n
+        region: None or str\n
+        precision : Number of decimal places to round to (default: 15);
+        None to skip the rounding\n
+        verbose : True or False (default: True)
+
+    Returns:
+        array: three arrays: the centres of the faces (shape (3, nfaces)),
+        the area vectors of the faces (normal to the faces and pointing out
+        of the domain, with the area of the faces as norm, shape
+        (3, nfaces)) and the areas of the faces (shape (nfaces,))
+
+    A way you might use me is:\n
+        centres, normals, areas = fluidfoam.getPatchGeometry(
+            'path_of_OpenFoam_case', 'bottom')
+        U = fluidfoam.readvector('path_of_OpenFoam_case', '0', 'U',
+                                 boundary='bottom')
+        flow_rate = np.sum(U * normals)
+
+    """
+
+    if time_name == "0":
+        time_name = None
+    if region is None:
+        meshpath = "/constant/polyMesh/"
+    else:
+        meshpath = "/constant/"+region+"/polyMesh/"
+    if not os.path.exists(path+meshpath):
+        raise ValueError(
+            "No ", meshpath, " directory in ",
+            path,
+            " Please verify the directory of your case.",
+        )
+
+    mesh = mesh_cache.get(path, time_name, region, precision)
+
+    def compute():
+        facefile = mesh.file("faces", verbose)
+        pointfile = mesh.file("points", verbose)
+        id0, nfaces = _patch_faces(mesh, boundary, verbose)
+        if nfaces == 0:
+            return np.empty((3, 0)), np.empty((3, 0)), np.empty(0)
+        offsets = facefile.offsets[id0: id0 + nfaces + 1]
+        area_vectors, centres = _face_geometry(
+            pointfile.values.reshape(-1, 3),
+            offsets - offsets[0],
+            facefile.labels[offsets[0]: offsets[-1]],
+        )
+        areas = np.sqrt((area_vectors**2).sum(axis=1))
+        return centres.T.copy(), area_vectors.T.copy(), areas
+
+    centres, area_vectors, areas = mesh.get(
+        ("patch geometry", boundary), compute
+    )
+    # the arrays of the cache are not returned
+    return centres.copy(), area_vectors.copy(), areas.copy()
+
+
 if __name__ == "__main__":
 
     dirs = ["ascii", "asciigz", "bin", "bingz"]
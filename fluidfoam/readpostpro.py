@@ -8,20 +8,7 @@ This module provides functions to list and read OpenFoam PostProcessing Files:
 import os
 import numpy as np
 #from glob import glob
-
-
-def _find_latesttime(path):
-    dir_list = os.listdir(path)
-    time_list = []
-
-    for directory in dir_list:
-        try:
-            float(directory)
-            time_list.append(directory)
-        except:
-            pass
-    time_list.sort(key=float)
-    return time_list[-1]
+from fluidfoam.readof import getTimeIndex
 
 
 def readforce(path, namepatch="forces", time_name="0", name="forces"):
@@ -50,18 +37,9 @@ def readforce(path, namepatch="forces", time_name="0", name="forces"):
     else:
         path_namepatch = path+'/postProcessing/'+namepatch
     if time_name == "latestTime":
-        time_name = _find_latesttime(path_namepatch)
+        time_name = getTimeIndex(path_namepatch).latest
     elif time_name == "mergeTime":
-        time_list = []
-        dir_list = os.listdir(path_namepatch)
-        for directory in dir_list:
-            try:
-                float(directory)
-                time_list.append(directory)
-            except:
-                pass
-        time_list.sort(key=float)
-        time_list = np.array(time_list)
+        time_list = np.array(getTimeIndex(path_namepatch).names)
         for timename in time_list:
             try:
                 tab = readforce(path, namepatch, timename, name+"_"+timename)
@@ -136,18 +114,9 @@ def readprobes(path, probes_name="probes", time_name="0", name="U"):
     else:
         path_probes_name = path+'/postProcessing/'+probes_name
     if time_name == "latestTime":
-        time_name = _find_latesttime(path_probes_name)
+        time_name = getTimeIndex(path_probes_name).latest
     elif time_name == "mergeTime":
-        time_list = []
-        dir_list = os.listdir(path_probes_name)
-        for directory in dir_list:
-            try:
-                float(directory)
-                time_list.append(directory)
-            except:
-                pass
-        time_list.sort(key=float)
-        time_list = np.array(time_list)
+        time_list = np.array(getTimeIndex(path_probes_name).names)
         for timename in time_list:
             probes_loc, time_vect, tab = readprobes(
                 path, probes_name, timename, name)
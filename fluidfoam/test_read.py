@@ -1,4 +1,10 @@
+import os
+import gzip
+import shutil
+import tempfile
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 
 # readof functions
 import fluidfoam
@@ -96,3 +102,467 @@ class SimpleTestCase(unittest.TestCase):
             fluidfoam.readmesh,
             fluidfoam.readfield,
         )
+
+    def test_read_memmap(self):
+        for sol in sols[:2]:
+            u = fluidfoam.readvector(sol, timename, "U")
+            u_map = fluidfoam.readvector(sol, timename, "U", memmap=True)
+            np.testing.assert_allclose(u, u_map)
+            taus = fluidfoam.readtensor(sol, timename, "Taus", boundary="top")
+            taus_map = fluidfoam.readtensor(
+                sol, timename, "Taus", boundary="top", memmap=True
+            )
+            np.testing.assert_allclose(taus, taus_map)
+            x, y, z = fluidfoam.readmesh(sol)
+            x_map, y_map, z_map = fluidfoam.readmesh(sol, memmap=True)
+            np.testing.assert_allclose(x, x_map)
+            np.testing.assert_allclose(z, z_map)
+        field = fluidfoam.OpenFoamFile(
+            "output_samples/bin", "0", "alpha", memmap=True
+        )
+        self.assertFalse(field.values.flags.writeable)
+
+    def test_read_no_rounding(self):
+        for sol in sols:
+            u = fluidfoam.readvector(sol, timename, "U", precision=None)
+            u_round = fluidfoam.readvector(sol, timename, "U", precision=3)
+            np.testing.assert_allclose(u, u_round, atol=1e-3)
+            np.testing.assert_array_equal(np.around(u, 3), u_round)
+            x, y, z = fluidfoam.readmesh(sol, precision=None)
+            np.testing.assert_allclose(x, fluidfoam.readmesh(sol)[0])
+        for precision in (None, 15):
+            alpha = fluidfoam.readfield(
+                "output_samples/bin", "0", "alpha", precision=precision
+            )
+            self.assertTrue(alpha.flags.writeable)
+
+    def test_read_cells(self):
+        cells = np.array([3, 0, 10, 63])
+        for sol in sols:
+            u = fluidfoam.readvector(sol, timename, "U")
+            np.testing.assert_equal(
+                fluidfoam.readvector(sol, timename, "U", cells=cells),
+                u[:, cells],
+            )
+            np.testing.assert_equal(
+                fluidfoam.readvector(sol, timename, "U", cells=slice(8, 16)),
+                u[:, 8:16],
+            )
+            alpha = fluidfoam.readscalar(sol, timename, "alpha")
+            np.testing.assert_equal(
+                fluidfoam.readscalar(sol, timename, "alpha", cells=cells),
+                alpha[cells],
+            )
+        with self.assertRaises(ValueError):
+            fluidfoam.readscalar(
+                sols[1], timename, "alpha", boundary="top", cells=cells
+            )
+
+    def test_readheader(self):
+        for sol in sols:
+            header = fluidfoam.readheader(sol, timename, "U")
+            self.assertEqual(header["class"], "volVectorField")
+            self.assertEqual(header["type"], "vector")
+            self.assertEqual(header["size"], 64)
+            self.assertFalse(header["uniform"])
+            header = fluidfoam.readheader(sol, timename, "alphauniform")
+            self.assertEqual(header["type"], "scalar")
+            self.assertTrue(header["uniform"])
+
+    def test_read_all_boundaries(self):
+        for sol in sols:
+            patches = fluidfoam.readfield(sol, timename, "sigma", boundary="*")
+            self.assertEqual(
+                list(patches),
+                ["inlet", "outlet", "top", "bottom", "frontAndBackPlanes"],
+            )
+            self.assertEqual(patches["top"][0], "calculated")
+            for patch in ("inlet", "top", "bottom"):
+                values = fluidfoam.readfield(
+                    sol, timename, "sigma", boundary=patch
+                )
+                np.testing.assert_allclose(patches[patch][1], values)
+            patches = fluidfoam.readfield(
+                sol, timename, "alphauniform", boundary="*"
+            )
+            self.assertEqual(patches["frontAndBackPlanes"][1].size, 128)
+            for read, name in (
+                (fluidfoam.readscalar, "alpha"),
+                (fluidfoam.readvector, "U"),
+                (fluidfoam.readsymmtensor, "sigma"),
+            ):
+                patches = read(sol, timename, name, boundary="*")
+                expected = fluidfoam.readfield(
+                    sol, timename, name, boundary="*"
+                )
+                self.assertEqual(list(patches), list(expected))
+                for patch, (type_patch, values) in expected.items():
+                    self.assertEqual(patches[patch][0], type_patch)
+                    np.testing.assert_equal(patches[patch][1], values)
+        # patches with value $internalField and with other entries before
+        # their value
+        with open("output_samples/ascii/0/sigma", "rb") as f:
+            content = f.read()
+        content = content.replace(
+            b"    inlet\n    {\n        type            cyclic;\n    }",
+            b"    inlet\n    {\n        type            fixedValue;\n"
+            b"        value           $internalField;\n    }",
+        ).replace(
+            b"    outlet\n    {\n        type            cyclic;\n    }",
+            b"    outlet\n    {\n        type            mixed;\n"
+            b"        refValue        uniform (0 0 0 0 0 0);\n"
+            b"        valueFraction   uniform 0;\n"
+            b"        value           uniform (1 2 3 4 5 6);\n    }",
+        )
+        sigma = fluidfoam.readfield(
+            "output_samples/ascii", timename, "sigma", boundary="*"
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copytree(
+                "output_samples/ascii/constant",
+                os.path.join(directory, "constant"),
+            )
+            os.mkdir(os.path.join(directory, timename))
+            with open(os.path.join(directory, timename, "q"), "wb") as f:
+                f.write(content)
+            patches = fluidfoam.readfield(directory, timename, "q", boundary="*")
+            self.assertEqual(list(patches), list(sigma))
+            self.assertEqual(patches["inlet"][0], "fixedValue")
+            np.testing.assert_equal(patches["inlet"][1], sigma["inlet"][1])
+            self.assertEqual(patches["outlet"][0], "mixed")
+            outlet = patches["outlet"][1]
+            self.assertEqual(outlet.shape, sigma["outlet"][1].shape)
+            np.testing.assert_equal(outlet[:, 0], np.arange(1, 7))
+            for patch in ("top", "bottom", "frontAndBackPlanes"):
+                self.assertEqual(patches[patch][0], sigma[patch][0])
+                np.testing.assert_equal(patches[patch][1], sigma[patch][1])
+            for patch in ("inlet", "top"):
+                np.testing.assert_equal(
+                    fluidfoam.readfield(
+                        directory, timename, "q", boundary=patch
+                    ),
+                    fluidfoam.readfield(
+                        "output_samples/ascii", timename, "sigma",
+                        boundary=patch,
+                    ),
+                )
+            outlet = fluidfoam.readfield(
+                directory, timename, "q", boundary="outlet"
+            )
+            np.testing.assert_equal(np.ravel(outlet), np.arange(1, 7))
+
+    def test_read_faces(self):
+        for sol in sols:
+            facefile = fluidfoam.OpenFoamFile(
+                sol + "constant/polyMesh/", name="faces"
+            )
+            self.assertEqual(facefile.offsets.size, facefile.nfaces + 1)
+            self.assertEqual(facefile.labels.size, facefile.offsets[-1])
+            self.assertEqual(len(facefile.faces), facefile.nfaces)
+            self.assertEqual(facefile.faces[10]["npts"], 4)
+            np.testing.assert_equal(
+                facefile.faces[10]["id_pts"], facefile.labels[40:44]
+            )
+
+    def test_readmesh_geometric(self):
+        sol = "output_samples/bin/par1/processor0"
+        centres = fluidfoam.readvector(sol, "0", "C")
+        x, y, z = fluidfoam.readmesh(sol, geometric=True)
+        np.testing.assert_allclose(x, centres[0], atol=1e-15)
+        np.testing.assert_allclose(z, centres[2], atol=1e-15)
+
+    def test_read_parallel(self):
+        for sol in (
+            "output_samples/ascii/par1",
+            "output_samples/bin/par1",
+            "output_samples/bin/par2",  # collated
+        ):
+            x, y, z = fluidfoam.readmesh(sol)
+            xp, yp, zp = fluidfoam.readmesh(sol, mode="parallel")
+            np.testing.assert_equal(xp, x)
+            np.testing.assert_equal(zp, z)
+            alpha = fluidfoam.readscalar(sol, "0", "alpha", mode="parallel")
+            self.assertEqual(alpha.shape, x.shape)
+            alpha_struct = fluidfoam.readscalar(
+                sol, "0", "alpha", structured=True, mode="parallel",
+                workers=1,
+            )
+            self.assertEqual(alpha_struct.shape, (1, 20, 1))
+        centres = fluidfoam.readvector(
+            "output_samples/bin/par1", "0", "C", mode="parallel"
+        )
+        np.testing.assert_allclose(centres, [x, y, z], atol=1e-15)
+        with self.assertRaises(ValueError):
+            fluidfoam.readscalar(
+                "output_samples/bin/par2/processors", "0", "alpha"
+            )
+
+    def test_getvolumes(self):
+        sol = "output_samples/bin/par1/processor0"
+        centres = fluidfoam.readvector(sol, "0", "C")
+        centroids, volumes = fluidfoam.getVolumes(sol)
+        np.testing.assert_allclose(centroids.T, centres, atol=1e-15)
+        np.testing.assert_allclose(volumes, 6.14125e-09)
+        centroids, volumes = fluidfoam.getVolumes("output_samples/bin/3d")
+        x, y, z = fluidfoam.readmesh("output_samples/bin/3d")
+        self.assertEqual(volumes.size, x.size)
+        self.assertTrue((volumes > 0).all())
+
+    def test_read_label64(self):
+        # two cubic cells along x, written with 64 bits labels
+        def write(directory, name, class_name, *arrays):
+            content = (
+                b"FoamFile\n{\n    format      binary;\n"
+                + b"    class       " + class_name + b";\n"
+                + b'    arch        "LSB;label=64;scalar=64";\n}\n\n'
+            )
+            for array in arrays:
+                content += b"%d\n(" % len(array) + array.tobytes() + b")\n"
+            with open(os.path.join(directory, name), "wb") as f:
+                f.write(content)
+
+        faces = [[1, 4, 10, 7], [0, 6, 9, 3], [2, 5, 11, 8]]
+        for i in range(2):
+            faces += [
+                [i, i + 1, i + 7, i + 6],
+                [i + 3, i + 9, i + 10, i + 4],
+                [i, i + 3, i + 4, i + 1],
+                [i + 6, i + 7, i + 10, i + 9],
+            ]
+        points = np.array(
+            [[i, j, k] for k in range(2) for j in range(2) for i in range(3)],
+            dtype=float,
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            meshpath = os.path.join(directory, "constant", "polyMesh")
+            os.makedirs(os.path.join(meshpath, "sets"))
+            write(
+                meshpath, "faces", b"faceCompactList",
+                np.arange(0, 45, 4, dtype=np.int64),
+                np.array(faces, dtype=np.int64).ravel(),
+            )
+            write(meshpath, "points", b"vectorField", points)
+            write(
+                meshpath, "owner", b"labelList",
+                np.array([0, 0, 1, 0, 0, 0, 0, 1, 1, 1, 1], dtype=np.int64),
+            )
+            write(
+                meshpath, "neighbour", b"labelList",
+                np.array([1], dtype=np.int64),
+            )
+            write(
+                os.path.join(meshpath, "sets"), "right", b"cellSet",
+                np.array([1], dtype=np.int64),
+            )
+            with open(os.path.join(meshpath, "boundary"), "w") as f:
+                f.write(
+                    "FoamFile\n{\n    format      ascii;\n"
+                    "    class       polyBoundaryMesh;\n}\n\n1\n(\n"
+                    "    walls\n    {\n        type            wall;\n"
+                    "        nFaces          10;\n"
+                    "        startFace       1;\n    }\n)\n"
+                )
+            facefile = fluidfoam.OpenFoamFile(meshpath, name="faces")
+            self.assertEqual(facefile.labels.dtype, np.int64)
+            self.assertEqual(facefile.nfaces, 11)
+            x, y, z = fluidfoam.readmesh(directory)
+            np.testing.assert_allclose(x, [0.5, 1.5])
+            np.testing.assert_allclose(y, [0.5, 0.5])
+            x, y, z = fluidfoam.readmesh(directory, sets="right")
+            np.testing.assert_allclose(x, [1.5])
+            x, y, z = fluidfoam.readmesh(directory, boundary="walls")
+            np.testing.assert_allclose(x[:2], [0, 2])
+            centroids, volumes = fluidfoam.getVolumes(directory)
+            np.testing.assert_allclose(volumes, [1, 1])
+            centres, normals, areas = fluidfoam.getPatchGeometry(
+                directory, "walls"
+            )
+            np.testing.assert_allclose(centres[:, 0], [0, 0.5, 0.5])
+            np.testing.assert_allclose(normals[:, 0], [-1, 0, 0])
+            np.testing.assert_allclose(areas, np.ones(10))
+            # closed surface
+            np.testing.assert_allclose(normals.sum(axis=1), 0, atol=1e-14)
+
+    def test_mesh_cache(self):
+        fluidfoam.mesh_cache.clear()
+        x, y, z = fluidfoam.readmesh("output_samples/bin")
+        self.assertGreater(fluidfoam.mesh_cache.nbytes, 0)
+        y[:] = 0.0
+        x_cached, y_cached, z_cached = fluidfoam.readmesh("output_samples/bin")
+        self.assertTrue((y_cached != 0).any())
+        fluidfoam.readfield("output_samples/bin", timename, "alpha",
+                            structured=True)
+        maxsize = fluidfoam.mesh_cache.maxsize
+        fluidfoam.mesh_cache.maxsize = 0
+        fluidfoam.readmesh("output_samples/bin")
+        self.assertEqual(fluidfoam.mesh_cache.nbytes, 0)
+        fluidfoam.mesh_cache.maxsize = maxsize
+
+    def test_mesh_disk_cache(self):
+        sol = "output_samples/bin"
+        x, y, z = fluidfoam.readmesh(sol, structured=True)
+        centroids, volumes = fluidfoam.getVolumes(sol)
+        with tempfile.TemporaryDirectory() as directory:
+            fluidfoam.mesh_cache.directory = directory
+            try:
+                for dummy in range(2):
+                    fluidfoam.mesh_cache.clear()
+                    x_disk, y_disk, z_disk = fluidfoam.readmesh(
+                        sol, structured=True
+                    )
+                    dummy, volumes_disk = fluidfoam.getVolumes(sol)
+                    self.assertTrue(os.listdir(directory))
+                    np.testing.assert_equal(y_disk, y)
+                    np.testing.assert_equal(volumes_disk, volumes)
+            finally:
+                fluidfoam.mesh_cache.directory = None
+                fluidfoam.mesh_cache.clear()
+
+    def test_read_gz_stream(self):
+        # fields larger than the blocks of decompression
+        values = np.random.default_rng(0).random(3 * 100000)
+        with tempfile.TemporaryDirectory() as directory:
+            for fmt in ("ascii", "binary"):
+                if fmt == "ascii":
+                    data = b"\n" + b"".join(
+                        b"(%r %r %r)\n" % tuple(vector)
+                        for vector in values.reshape(-1, 3).tolist()
+                    )
+                else:
+                    data = values.tobytes()
+                content = (
+                    b"FoamFile\n{\n    format      " + fmt.encode()
+                    + b";\n    class       volVectorField;\n}\n"
+                    + b"dimensions      [0 1 -1 0 0 0 0];\n\n"
+                    + b"internalField   nonuniform List<vector>\n100000\n("
+                    + data + b")\n;\n\nboundaryField\n{\n}\n"
+                )
+                path = os.path.join(directory, "U_" + fmt)
+                with open(path, "wb") as f:
+                    f.write(content)
+                with gzip.open(path + "gz.gz", "wb") as f:
+                    f.write(content)
+                u = fluidfoam.readvector(directory, None, "U_" + fmt)
+                u_gz = fluidfoam.readvector(directory, None, "U_" + fmt + "gz")
+                np.testing.assert_equal(u_gz, u)
+                np.testing.assert_allclose(u, values.reshape(3, -1, order="F"))
+                for name in ("U_" + fmt, "U_" + fmt + "gz"):
+                    u32 = fluidfoam.readvector(
+                        directory, None, name, dtype=np.float32
+                    )
+                    self.assertEqual(u32.dtype, np.float32)
+                    np.testing.assert_equal(u32, u.astype(np.float32))
+
+    def test_read_dtype(self):
+        for sol in sols:
+            u = fluidfoam.readvector(sol, timename, "U", dtype=np.float32)
+            self.assertEqual(u.dtype, np.float32)
+            np.testing.assert_allclose(
+                u, fluidfoam.readvector(sol, timename, "U"), rtol=1e-6
+            )
+            fields = fluidfoam.readfields(
+                sol, timename, ["alpha", "Taus"], dtype="float32"
+            )
+            self.assertEqual(fields["Taus"].dtype, np.float32)
+        # binary file in single precision
+        values = np.random.default_rng(0).random(10).astype(np.float32)
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "alpha"), "wb") as f:
+                f.write(
+                    b"FoamFile\n{\n    format      binary;\n"
+                    + b"    class       volScalarField;\n"
+                    + b'    arch        "LSB;label=32;scalar=32";\n}\n'
+                    + b"dimensions      [0 0 0 0 0 0 0];\n\n"
+                    + b"internalField   nonuniform List<scalar>\n10\n("
+                    + values.tobytes() + b")\n;\n\nboundaryField\n{\n}\n"
+                )
+            alpha = fluidfoam.readscalar(directory, None, "alpha")
+            self.assertEqual(alpha.dtype, np.float32)
+            np.testing.assert_equal(alpha, values)
+            alpha[alpha < 0.5] = 0
+            alpha = fluidfoam.readscalar(
+                directory, None, "alpha", cells=slice(2, 8)
+            )
+            self.assertTrue(alpha.flags.writeable)
+            np.testing.assert_equal(alpha, values[2:8])
+            alpha = fluidfoam.readscalar(
+                directory, None, "alpha", precision=None, dtype=float
+            )
+            self.assertEqual(alpha.dtype, np.float64)
+            np.testing.assert_equal(alpha, values)
+
+    def test_readfields(self):
+        for sol in sols:
+            fields = fluidfoam.readfields(sol, timename, workers=2)
+            self.assertIn("alpha", fields)
+            np.testing.assert_equal(
+                fields["U"], fluidfoam.readfield(sol, timename, "U")
+            )
+            fields = fluidfoam.readfields(
+                sol, timename, ["alpha", "sigma"], workers=1
+            )
+            self.assertEqual(list(fields), ["alpha", "sigma"])
+
+    def test_read_structured_no_rounding(self):
+        for precision in (15, None):
+            x, y, z = fluidfoam.readmesh(
+                "output_samples/bin/3d", structured=True, precision=precision
+            )
+            self.assertEqual(x.shape, (16, 64, 16))
+
+    def test_read_empty_set(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            shutil.copytree(
+                "output_samples/ascii/constant", os.path.join(tmp, "constant")
+            )
+            path = os.path.join(tmp, "constant", "polyMesh", "sets", "empty")
+            with open(path, "w") as f:
+                f.write(
+                    "FoamFile\n{\n    format      ascii;\n"
+                    "    class       cellSet;\n}\n\n0\n(\n)\n"
+                )
+            x, y, z = fluidfoam.readmesh(tmp, sets="empty")
+            self.assertEqual(x.size, 0)
+
+    def test_time_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("0", "0.5", "10", "2", "constant"):
+                os.mkdir(os.path.join(tmp, name))
+            open(os.path.join(tmp, "3"), "w").close()
+            times = fluidfoam.getTimeIndex(tmp)
+            self.assertEqual(list(times), ["0", "0.5", "2", "10"])
+            np.testing.assert_equal(times.times, [0, 0.5, 2, 10])
+            self.assertEqual(times.latest, "10")
+            self.assertEqual(times.nearest(1.4), "2")
+            self.assertEqual(times.nearest(-1), "0")
+            self.assertEqual(times.nearest(100), "10")
+            self.assertEqual(times.select(0.5, 2), ["0.5", "2"])
+            self.assertEqual(times.select(start=3), ["10"])
+            self.assertIs(fluidfoam.getTimeIndex(tmp), times)
+            os.mkdir(os.path.join(tmp, "20"))
+            self.assertEqual(fluidfoam.getTimeIndex(tmp).latest, "20")
+
+    def test_read_processes(self):
+        # the results of the processes are sent back in shared memory
+        with ProcessPoolExecutor(2) as executor:
+            fields = fluidfoam.readfields(
+                sols[0], timename, ["alpha", "U"], workers=executor
+            )
+            np.testing.assert_equal(
+                fields["U"], fluidfoam.readfield(sols[0], timename, "U")
+            )
+            for sol in (
+                "output_samples/ascii/par1",
+                "output_samples/bin/par2",
+            ):
+                alpha = fluidfoam.readscalar(
+                    sol, "0", "alpha", mode="parallel", workers=executor
+                )
+                np.testing.assert_equal(
+                    alpha,
+                    fluidfoam.readscalar(sol, "0", "alpha", mode="parallel"),
+                )
+                np.testing.assert_equal(
+                    fluidfoam.readmesh(sol, mode="parallel", workers=executor),
+                    fluidfoam.readmesh(sol),
+                )
@@ -0,0 +1,62 @@
+"""Tests of the MPI reader, run for example with
+
+    mpirun -n 2 python -m pytest fluidfoam/test_readmpi.py
+
+"""
+
+import unittest
+import numpy as np
+
+import fluidfoam
+
+try:
+    from mpi4py import MPI
+except ImportError:
+    MPI = None
+
+cases = [
+    "output_samples/ascii/par1",
+    "output_samples/bin/par1",
+    "output_samples/bin/par2",
+]
+
+
+@unittest.skipUnless(MPI, "mpi4py is not installed")
+class MPIReaderTest(unittest.TestCase):
+    def test_read_mpi(self):
+        from fluidfoam.readmpi import MPIReader
+
+        for case in cases:
+            reader = MPIReader(case)
+            alpha = reader.readfield("0", "alpha")
+            centres = reader.readmesh()
+            volumes = reader.volumes()
+            ref_alpha = fluidfoam.readscalar(
+                case, "0", "alpha", mode="parallel", verbose=False
+            )
+            ref_volumes = fluidfoam.getVolumes(case, verbose=False)[1]
+            self.assertAlmostEqual(
+                reader.sum(volumes), np.sum(ref_volumes), places=15
+            )
+            self.assertAlmostEqual(
+                reader.mean(alpha, volumes),
+                np.sum(ref_alpha * ref_volumes) / np.sum(ref_volumes),
+            )
+            hist, edges = reader.histogram(alpha, bins=4)
+            np.testing.assert_array_equal(
+                hist, np.histogram(ref_alpha, bins=4)[0]
+            )
+
+            alpha = reader.gather(alpha)
+            centres = reader.gather(centres)
+            if reader.comm.Get_rank() != 0:
+                self.assertIsNone(alpha)
+                continue
+            np.testing.assert_allclose(alpha, ref_alpha)
+            np.testing.assert_allclose(
+                centres, fluidfoam.readmesh(case, verbose=False)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()